@@ -54,6 +54,22 @@ from bpy.types import (
         )        
 
 
+# Module level, Blender doesn't keep the strings of items given by a function.
+CELL_BACKEND_ITEMS = (
+        ('GRID', "Per Cell", "Cut each cell by the seeds around it"),
+        ('VORONOI', "Voronoi", "Make all cells at once from the Voronoi diagram of the seeds, "
+                               "much faster for many cells"),
+        )
+
+
+def _cell_backend_items(self, context):
+    """The Voronoi backend is only offered when SciPy is installed."""
+    from .core import voronoi
+    if voronoi.voronoi_available():
+        return CELL_BACKEND_ITEMS
+    return CELL_BACKEND_ITEMS[:1]
+
+
 class FRACTURE_PT_Menu(Panel):
     bl_idname = 'FRACTURE_PT_Menu'
     bl_label = "Fracture Cell"
@@ -71,6 +87,8 @@ class FRACTURE_PT_Menu(Panel):
                     text="1. Cell Fracture")       
         layout.operator(operator.FRACTURE_OT_Crack.bl_idname,
                     text="2. Cell to Crack")
+        layout.operator(operator.FRACTURE_OT_Explode.bl_idname,
+                    text="Explode Packed Cells")
         
         material_props = context.window_manager.fracture_material_props
         layout.separator()
@@ -130,6 +148,14 @@ class FractureCellProperties(PropertyGroup):
             min=0, max=2000,
             default=0,
             )
+    source_random_bounds: EnumProperty(
+            name="Random Bounds",
+            items=(('BOX', "Bound Box", "Random seeds anywhere in the box around the object"),
+                   ('VOLUME', "Volume", "Random seeds only inside the object, "
+                                        "no cells are made and cut for nothing (needs a closed mesh)"),
+                   ),
+            default='BOX',
+            )
     '''        
     source_limit: IntProperty(
             name="Source Limit",
@@ -159,6 +185,41 @@ class FractureCellProperties(PropertyGroup):
             min=0.0, max=1.0,
             default=(1.0, 1.0, 1.0),
             )
+    cell_processes: IntProperty(
+            name="Processes",
+            description="Compute cells in parallel worker processes, 0 uses all CPU cores (Linux only, disabled elsewhere)",
+            min=0, max=256,
+            default=1,
+            )
+    cell_backend: EnumProperty(
+            name="Backend",
+            items=_cell_backend_items,
+            )
+    cell_bounds: EnumProperty(
+            name="Bounds",
+            items=(('BOX', "Bound Box", "Clip cells with the axis aligned box around the original"),
+                   ('ORIENTED', "Oriented Box", "Clip cells with the original's own bound box, following its rotation"),
+                   ('HULL', "Convex Hull", "Clip cells with the convex hull of the original, "
+                                           "less cells outside of thin, rotated or concave objects"),
+                   ),
+            default='BOX',
+            )
+    cell_engine: EnumProperty(
+            name="Engine",
+            items=(('BOOLEAN', "Boolean", "Intersect each cell with the original by a boolean modifier"),
+                   ('BISECT', "Bisect", "Cut the original by the planes of each cell and fill the cuts, "
+                                        "faster on low poly originals, but cuts through holes are filled"),
+                   ),
+            default='BOOLEAN',
+            )
+    boolean_workers: IntProperty(
+            name="Boolean Workers",
+            description="Run the booleans in this many background Blender processes, "
+                        "0 or 1 runs them here. Starting them takes a few seconds, "
+                        "only worth it for many cells",
+            min=0, max=64,
+            default=0,
+            )
     pre_simplify : FloatProperty(
             name="Simplify Base Mesh",
             description="Simplify base mesh before making cell. Lower face size, faster calculation",
@@ -184,6 +245,15 @@ class FractureCellProperties(PropertyGroup):
             min=0, max=2000,
             default=0,
             )
+    recursion_mode: EnumProperty(
+            name="Recursion Mode",
+            items=(('BOOLEAN', "Boolean", "Cut the cells of each level from the original, "
+                                          "then break the cut cells again"),
+                   ('GEOMETRY', "Geometry", "Break the Voronoi cells again before any cut, "
+                                            "only the final cells are cut from the original"),
+                   ),
+            default='BOOLEAN',
+            )
     recursion_source_limit: IntProperty(
             name="Fracture Each",
             description="Limit the number of input points, 0 for unlimited (applies to recursion only)",
@@ -196,6 +266,27 @@ class FractureCellProperties(PropertyGroup):
             min=0, max=10000,
             default=250,
             )
+    recursion_time_limit: FloatProperty(
+            name="Time Limit",
+            description="Stop recursion before this many seconds are spent on the fracture, zero disables",
+            min=0.0, max=3600.0,
+            default=0.0,
+            subtype='TIME', unit='TIME',
+            )
+    recursion_poly_limit: IntProperty(
+            name="Max Faces",
+            description="Stop recursion when the cells have this many faces in total, zero disables. "
+                        "Geometry recursion counts the faces before the cut",
+            min=0, max=100000000,
+            default=0,
+            )
+    recursion_memory_limit: IntProperty(
+            name="Max Memory",
+            description="Stop recursion when Blender uses this many megabytes of memory, zero disables. "
+                        "Not checked on Windows unless psutil is installed",
+            min=0, max=1048576,
+            default=0,
+            )
     recursion_chance: FloatProperty(
             name="Recursion Chance",
             description="Likelihood of recursion",
@@ -271,6 +362,14 @@ class FractureCellProperties(PropertyGroup):
             description="Move cells beside the original object.",
             default=False,
             )
+    cell_output: EnumProperty(
+            name="Output",
+            items=(('OBJECTS', "Objects", "Make an object for each cell"),
+                   ('PACKED', "Packed", "Make one object of all cells, with the cell of each face "
+                                        "and vertex in a \"cell_id\" layer, explode cells to objects when needed"),
+                   ),
+            default='OBJECTS',
+            )
     # -------------------------------------------------------------------------
     # Custom Property Options    
     use_mass: BoolProperty(
@@ -392,6 +491,7 @@ classes = (
     operator.FRACTURE_OT_Cell,
     operator.FRACTURE_OT_Crack,
     operator.FRACTURE_OT_Material,
+    operator.FRACTURE_OT_Explode,
     FRACTURE_PT_Menu,
     )
 
@@ -0,0 +1,223 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+import numpy as np
+
+
+def _ranges(offsets, indices):
+    """Indices of the items of the given ranges of offsets, joined, and the size of each range."""
+    starts = offsets[indices]
+    totals = offsets[indices + 1] - starts
+    shift = starts - np.concatenate(([0], np.cumsum(totals)[:-1]))
+    return np.arange(totals.sum()) + np.repeat(shift, totals), totals
+
+
+class CellSet:
+    """Cells as flat arrays instead of one object per vertex or face.
+
+    - ``verts``: (V, 3) float32 vertices, relative to the center of their cell.
+    - ``vert_offsets``: (n + 1) start of each cell in ``verts``.
+    - ``loops``: (L) vertex indices of all faces, counted from the start of their cell.
+    - ``face_offsets``: (F + 1) start of each face in ``loops``.
+    - ``cell_face_offsets``: (n + 1) start of each cell in the faces.
+    - ``face_planes``: (F) index of the clip plane each face lies on, -1 for the others.
+    - ``centers``: (n, 3) cell centers, the seed locations.
+    - ``seed_ids``: (n) index of the seed of each cell.
+    - ``seed_sources``: (n) index of the seed source tag of each cell in ``source_names``.
+    """
+    __slots__ = (
+        "verts",
+        "vert_offsets",
+        "loops",
+        "face_offsets",
+        "cell_face_offsets",
+        "face_planes",
+        "centers",
+        "seed_ids",
+        "seed_sources",
+        "source_names",
+        )
+
+    def __init__(self, verts, vert_offsets, loops, face_offsets, cell_face_offsets,
+                 centers, seed_ids, seed_sources=None, source_names=(), face_planes=None):
+        self.verts = np.asarray(verts, dtype=np.float32).reshape(-1, 3)
+        self.vert_offsets = np.asarray(vert_offsets, dtype=np.int64)
+        self.loops = np.asarray(loops, dtype=np.int32)
+        self.face_offsets = np.asarray(face_offsets, dtype=np.int64)
+        self.cell_face_offsets = np.asarray(cell_face_offsets, dtype=np.int64)
+        self.centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+        self.seed_ids = np.asarray(seed_ids, dtype=np.int64)
+        if seed_sources is None:
+            seed_sources = np.zeros(len(self.seed_ids), dtype=np.int16)
+        self.seed_sources = np.asarray(seed_sources, dtype=np.int16)
+        self.source_names = tuple(source_names)
+        if face_planes is None:
+            face_planes = np.full(len(self.face_offsets) - 1, -1, dtype=np.int32)
+        self.face_planes = np.asarray(face_planes, dtype=np.int32)
+
+    @classmethod
+    def empty(cls):
+        return cls(np.zeros((0, 3)), [0], [], [0], [0], np.zeros((0, 3)), [])
+
+    @classmethod
+    def from_polytopes(cls, polytopes):
+        """Build from (seed_id, verts, faces, face_planes) of each cell, as python lists.
+
+        Each cell is written straight into flat typed buffers, so no python objects
+        are kept per vertex or face until the arrays are made.
+        """
+        from array import array
+        from itertools import chain
+        seed_ids = array("q")
+        verts = array("f")
+        vert_offsets = array("q", [0])
+        loops = array("i")
+        face_offsets = array("q", [0])
+        cell_face_offsets = array("q", [0])
+        face_planes = array("i")
+        for seed_id, cell_verts, cell_faces, cell_face_planes in polytopes:
+            seed_ids.append(seed_id)
+            verts.extend(chain.from_iterable(cell_verts))
+            vert_offsets.append(len(verts) // 3)
+            for face in cell_faces:
+                loops.extend(face)
+                face_offsets.append(len(loops))
+            cell_face_offsets.append(len(face_offsets) - 1)
+            face_planes.extend(cell_face_planes)
+        return cls(np.frombuffer(verts, dtype=np.float32).reshape(-1, 3), np.frombuffer(vert_offsets, dtype=np.int64),
+                   np.frombuffer(loops, dtype=np.int32), np.frombuffer(face_offsets, dtype=np.int64),
+                   np.frombuffer(cell_face_offsets, dtype=np.int64),
+                   np.zeros((len(seed_ids), 3)), np.frombuffer(seed_ids, dtype=np.int64),
+                   face_planes=np.frombuffer(face_planes, dtype=np.int32))
+
+    @classmethod
+    def concatenate(cls, cellsets):
+        """Join cell sets, keeping their order. Source tags must use the same names."""
+        cellsets = [cellset for cellset in cellsets if len(cellset)]
+        if not cellsets:
+            return cls.empty()
+        if len(cellsets) == 1:
+            return cellsets[0]
+
+        def offsets(arrays, totals):
+            # Shift each offsets array after the first by the total of the previous ones.
+            shift = np.cumsum([0] + totals[:-1])
+            return np.concatenate([arrays[0]] + [a[1:] + s for a, s in zip(arrays[1:], shift[1:])])
+
+        return cls(
+            np.concatenate([c.verts for c in cellsets]),
+            offsets([c.vert_offsets for c in cellsets], [len(c.verts) for c in cellsets]),
+            np.concatenate([c.loops for c in cellsets]),
+            offsets([c.face_offsets for c in cellsets], [len(c.loops) for c in cellsets]),
+            offsets([c.cell_face_offsets for c in cellsets], [len(c.face_offsets) - 1 for c in cellsets]),
+            np.concatenate([c.centers for c in cellsets]),
+            np.concatenate([c.seed_ids for c in cellsets]),
+            np.concatenate([c.seed_sources for c in cellsets]),
+            cellsets[0].source_names,
+            np.concatenate([c.face_planes for c in cellsets]),
+            )
+
+    def __len__(self):
+        return len(self.seed_ids)
+
+    def take(self, indices):
+        """Cell set of only the given cells, in that order."""
+        indices = np.asarray(indices, dtype=np.int64)
+        vert_index, verts_total = _ranges(self.vert_offsets, indices)
+        face_index, faces_total = _ranges(self.cell_face_offsets, indices)
+        loop_index, loops_total = _ranges(self.face_offsets, face_index)
+        return CellSet(
+            self.verts[vert_index],
+            np.concatenate(([0], np.cumsum(verts_total))),
+            # Loops count from the start of their cell, they don't change.
+            self.loops[loop_index],
+            np.concatenate(([0], np.cumsum(loops_total))),
+            np.concatenate(([0], np.cumsum(faces_total))),
+            self.centers[indices],
+            self.seed_ids[indices],
+            self.seed_sources[indices],
+            self.source_names,
+            self.face_planes[face_index],
+            )
+
+    def source(self, i):
+        """Seed source tag of a cell, e.g. 'VERTS'."""
+        if not self.source_names:
+            return None
+        return self.source_names[self.seed_sources[i]]
+
+    def radii(self):
+        """Distance from the center to the furthest vertex of each cell."""
+        if not len(self):
+            return np.zeros(0)
+        lengths = np.sqrt((self.verts.astype(np.float64) ** 2).sum(axis=1))
+        return np.maximum.reduceat(lengths, self.vert_offsets[:-1])
+
+    def cell_planes(self, i):
+        """(k, 4) planes of the faces of a cell relative to its center, normals pointing out."""
+        verts = self.cell_verts(i).astype(np.float64)
+        loops, loop_starts, loop_totals = self.cell_loops(i)
+        # Newell's method, robust for faces that are not exactly planar.
+        co = verts[loops]
+        co_next = verts[np.roll(loops, -1)]
+        face_index = np.repeat(np.arange(len(loop_starts)), loop_totals)
+        # The next vertex of the last loop of each face is the first of the face.
+        co_next[loop_starts + loop_totals - 1] = co[loop_starts]
+        cross = np.cross(co, co_next)
+        normals = np.zeros((len(loop_starts), 3))
+        np.add.at(normals, face_index, cross)
+        normals /= np.sqrt((normals ** 2).sum(axis=1))[:, np.newaxis]
+        planes = np.empty((len(normals), 4))
+        planes[:, :3] = normals
+        planes[:, 3] = -(normals * co[loop_starts]).sum(axis=1)
+        return planes
+
+    def cell_verts(self, i):
+        """(k, 3) vertices of a cell, relative to its center."""
+        return self.verts[self.vert_offsets[i]:self.vert_offsets[i + 1]]
+
+    def cell_loops(self, i):
+        """Vertex indices of the faces of a cell, with the start and length of each face in them."""
+        face_start, face_end = self.cell_face_offsets[i], self.cell_face_offsets[i + 1]
+        face_offsets = self.face_offsets[face_start:face_end + 1]
+        loops = self.loops[face_offsets[0]:face_offsets[-1]]
+        return loops, face_offsets[:-1] - face_offsets[0], np.diff(face_offsets)
+
+    def cell_faces(self, i):
+        """Faces of a cell as lists of vertex indices."""
+        loops, loop_starts, loop_totals = self.cell_loops(i)
+        return [loops[start:start + total].tolist()
+                for start, total in zip(loop_starts.tolist(), loop_totals.tolist())]
+
+    def packed(self):
+        """All cells as one mesh: (verts, loops, loop_starts, loop_totals, face_cells, vert_cells).
+
+        Vertices are moved to their cell centers, loops count from the first vertex,
+        face_cells and vert_cells are the cell index of each face and vertex.
+        """
+        cells_total = len(self)
+        verts_total = np.diff(self.vert_offsets)
+        faces_total = np.diff(self.cell_face_offsets)
+        vert_cells = np.repeat(np.arange(cells_total, dtype=np.int32), verts_total)
+        face_cells = np.repeat(np.arange(cells_total, dtype=np.int32), faces_total)
+        verts = (self.verts + self.centers[vert_cells]).astype(np.float32)
+        loop_totals = np.diff(self.face_offsets)
+        loops = self.loops + np.repeat(self.vert_offsets[face_cells], loop_totals).astype(np.int32)
+        return verts, loops, self.face_offsets[:-1], loop_totals, face_cells, vert_cells
@@ -0,0 +1,174 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+# Script copyright (C) Blender Foundation 2012
+
+from math import atan2
+
+
+class ConvexCell:
+    """Convex polytope of a cell, cut by one half-space at a time.
+
+    Planes are (x, y, z, scaler) like ``convexPlanes``, keeping the side where
+    ``x * px + y * py + z * pz + scaler <= 0``. Faces are vertex index loops,
+    counter-clockwise seen from outside, each with the index of its plane.
+    """
+    __slots__ = ("verts", "faces", "face_planes")
+
+    EPSILON = 1e-6
+
+    def __init__(self, planes):
+        # Start from a cube around all planes, then cut it by each of them.
+        # The planes should bound a region (include the bounding box planes).
+        s = 2.0 * max([abs(plane[3]) for plane in planes], default=0.0) + 1.0
+        self.verts = [
+            (-s, -s, -s), (+s, -s, -s), (+s, +s, -s), (-s, +s, -s),
+            (-s, -s, +s), (+s, -s, +s), (+s, +s, +s), (-s, +s, +s),
+            ]
+        self.faces = [
+            [0, 3, 2, 1], [4, 5, 6, 7],
+            [0, 1, 5, 4], [1, 2, 6, 5],
+            [2, 3, 7, 6], [3, 0, 4, 7],
+            ]
+        self.face_planes = [-1] * 6
+        for plane_index, plane in enumerate(planes):
+            if not self.cut(plane, plane_index):
+                break
+
+    @classmethod
+    def from_polytope(cls, verts, faces, face_planes):
+        """Start from a known convex polytope rather than from the planes, e.g. a Voronoi cell."""
+        cell = cls.__new__(cls)
+        cell.verts = [tuple(co) for co in verts]
+        cell.faces = [list(face) for face in faces]
+        cell.face_planes = list(face_planes)
+        return cell
+
+    def __bool__(self):
+        return bool(self.faces)
+
+    def radius_squared(self):
+        """Squared distance of the farthest vertex from the origin."""
+        return max([x * x + y * y + z * z for x, y, z in self.verts], default=0.0)
+
+    def cut(self, plane, plane_index):
+        """Clip by a half-space. Returns False when nothing is left of the cell.
+
+        Only the faces crossing the plane are touched, and the new cap face
+        is made from the crossing points, so the cost follows the cell size.
+        """
+        px, py, pz, pd = plane[0], plane[1], plane[2], plane[3]
+        eps = self.EPSILON
+        verts = self.verts
+        dist = [px * x + py * y + pz * z + pd for x, y, z in verts]
+
+        if max(dist, default=0.0) <= eps:
+            # Whole cell is inside, the plane is redundant.
+            return True
+        if min(dist) >= -eps:
+            # Whole cell is outside (or flattened on the plane).
+            self.verts = []
+            self.faces = []
+            self.face_planes = []
+            return False
+
+        edge_verts = {}
+        cap = set()
+        faces = []
+        face_planes = []
+        for face, face_plane in zip(self.faces, self.face_planes):
+            if max([dist[v] for v in face]) < -eps:
+                # Untouched face.
+                faces.append(face)
+                face_planes.append(face_plane)
+                continue
+            face_new = []
+            v_prev = face[-1]
+            d_prev = dist[v_prev]
+            for v_curr in face:
+                d_curr = dist[v_curr]
+                # Add the crossing point of the edge, shared with the neighbour face.
+                if (d_prev < -eps and d_curr > eps) or (d_prev > eps and d_curr < -eps):
+                    key = (v_prev, v_curr) if v_prev < v_curr else (v_curr, v_prev)
+                    v_new = edge_verts.get(key)
+                    if v_new is None:
+                        t = d_prev / (d_prev - d_curr)
+                        a = verts[v_prev]
+                        b = verts[v_curr]
+                        v_new = len(verts)
+                        verts.append((a[0] + (b[0] - a[0]) * t,
+                                      a[1] + (b[1] - a[1]) * t,
+                                      a[2] + (b[2] - a[2]) * t))
+                        edge_verts[key] = v_new
+                    face_new.append(v_new)
+                    cap.add(v_new)
+                if d_curr <= eps:
+                    face_new.append(v_curr)
+                    if d_curr >= -eps:
+                        cap.add(v_curr)
+                v_prev = v_curr
+                d_prev = d_curr
+            if len(face_new) >= 3:
+                faces.append(face_new)
+                face_planes.append(face_plane)
+
+        if len(cap) >= 3:
+            # Order the cap around its center, counter-clockwise seen along the plane normal.
+            cap = list(cap)
+            if abs(px) < 0.9:
+                ux, uy, uz = 0.0, -pz, py
+            else:
+                ux, uy, uz = pz, 0.0, -px
+            vx = py * uz - pz * uy
+            vy = pz * ux - px * uz
+            vz = px * uy - py * ux
+            cx = sum([verts[v][0] for v in cap]) / len(cap)
+            cy = sum([verts[v][1] for v in cap]) / len(cap)
+            cz = sum([verts[v][2] for v in cap]) / len(cap)
+
+            def cap_angle(v):
+                x, y, z = verts[v]
+                x -= cx
+                y -= cy
+                z -= cz
+                return atan2(x * vx + y * vy + z * vz, x * ux + y * uy + z * uz)
+
+            cap.sort(key=cap_angle)
+            faces.append(cap)
+            face_planes.append(plane_index)
+
+        # Remove the vertices cut away, and re-index the faces.
+        # Every vertex left inside or on the plane is still used by its faces.
+        remap = [-1] * len(verts)
+        verts_new = []
+        for v, d in enumerate(dist):
+            if d <= eps:
+                remap[v] = len(verts_new)
+                verts_new.append(verts[v])
+        for v in range(len(dist), len(verts)):
+            remap[v] = len(verts_new)
+            verts_new.append(verts[v])
+        for face in faces:
+            face[:] = [remap[v] for v in face]
+
+        self.verts = verts_new
+        self.faces = faces
+        self.face_planes = face_planes
+        return True
@@ -0,0 +1,58 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+import numpy as np
+
+
+def random_points(xyz_min, xyz_max, count):
+    """(count, 3) points uniformly distributed in a box."""
+    return np.random.uniform(xyz_min, xyz_max, size=(count, 3))
+
+
+def random_points_in_planes(xyz_min, xyz_max, planes, count, tries=8):
+    """Up to (count, 3) points uniformly distributed in the part of a box inside (m, 4) planes.
+
+    Points are drawn in batches and rejected by the planes, for at most ``tries`` batches,
+    so fewer than count points are returned when little of the box is inside.
+    """
+    planes = np.asarray(planes, dtype=np.float64).reshape(-1, 4)
+    points = []
+    points_total = 0
+    for _ in range(tries):
+        co = random_points(xyz_min, xyz_max, 2 * (count - points_total) + 8)
+        co = co[((co @ planes[:, :3].T + planes[:, 3]) <= 0.0).all(axis=1)]
+        points.append(co)
+        points_total += len(co)
+        if points_total >= count:
+            break
+    return np.concatenate(points)[:count]
+
+
+def random_unit_vectors(count):
+    """(count, 3) directions uniformly distributed on the unit sphere."""
+    vectors = np.random.normal(size=(count, 3))
+    lengths = np.sqrt((vectors * vectors).sum(axis=1))
+    lengths[lengths == 0.0] = 1.0
+    return vectors / lengths[:, np.newaxis]
+
+
+def noise_offsets(count, scalar):
+    """(count, 3) random offsets, up to scalar long."""
+    return random_unit_vectors(count) * (scalar * np.random.random(count))[:, np.newaxis]
@@ -0,0 +1,142 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+import numpy as np
+
+
+def minmax(co):
+    """Bounds of (n, 3) points as two arrays, (min, max)."""
+    co = np.asarray(co, dtype=np.float64).reshape(-1, 3)
+    return co.min(axis=0), co.max(axis=0)
+
+
+def transform(matrix, co):
+    """Apply a 4x4 matrix to (n, 3) points in one go."""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    co = np.asarray(co, dtype=np.float64).reshape(-1, 3)
+    return co @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def transform_planes(matrix, planes):
+    """Apply a 4x4 matrix to (n, 4) planes (x, y, z, scaler), keeping the normals unit length."""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    planes = np.asarray(planes, dtype=np.float64).reshape(-1, 4)
+    # A plane p holds local points where p . local = p . (matrix^-1 . world) = 0.
+    planes = planes @ np.linalg.inv(matrix)
+    planes /= np.sqrt((planes[:, :3] ** 2).sum(axis=1))[:, np.newaxis]
+    return planes
+
+
+def unique_planes(planes, precision=5):
+    """Remove the repeated (n, 4) planes, e.g. coplanar triangles of a hull."""
+    planes = np.asarray(planes, dtype=np.float64).reshape(-1, 4)
+    _, index = np.unique(np.round(planes, precision), axis=0, return_index=True)
+    return planes[np.sort(index)]
+
+
+class PointGrid:
+    """Uniform grid over points, for radius queries sorted by distance.
+
+    Points of a grid cell are contiguous in ``order``, with grid cells
+    ordered x, y then z, so a z column of cells is a single slice.
+    """
+
+    # Points per grid cell aimed for.
+    DENSITY = 2.0
+
+    def __init__(self, co):
+        co = np.asarray(co, dtype=np.float64).reshape(-1, 3)
+        self.co = co
+        points_total = max(len(co), 1)
+
+        if len(co):
+            lo, hi = minmax(co)
+        else:
+            lo = hi = np.zeros(3)
+        extent = np.maximum(hi - lo, 1e-9)
+        size = max((np.prod(extent) * self.DENSITY / points_total) ** (1.0 / 3.0),
+                   extent.max() / 1024.0)
+        # Flat point sets would give a huge grid, keep it about the size of the points.
+        while True:
+            dims = np.maximum(np.ceil(extent / size).astype(np.int64), 1)
+            if np.prod(dims) <= 8 * points_total + 8:
+                break
+            size *= 1.25
+
+        self.lo = lo
+        self.size = size
+        self.dims = dims
+
+        keys = self._keys(co)
+        cells = (keys[:, 0] * dims[1] + keys[:, 1]) * dims[2] + keys[:, 2]
+        self.order = np.argsort(cells, kind="stable")
+        counts = np.bincount(cells, minlength=int(np.prod(dims)))
+        self.starts = np.concatenate(([0], np.cumsum(counts)))
+
+    def __len__(self):
+        return len(self.co)
+
+    def _keys(self, co):
+        keys = np.floor((co - self.lo) / self.size).astype(np.int64)
+        return np.clip(keys, 0, self.dims - 1)
+
+    def covers(self, co, radius):
+        """True when a sphere holds all the points of the grid."""
+        co = np.asarray(co, dtype=np.float64)
+        far = np.maximum(np.abs(self.lo - co), np.abs(self.lo + self.dims * self.size - co))
+        return radius * radius >= np.dot(far, far)
+
+    def find_range(self, co, radius):
+        """Indices and distances of the points within radius, closest first."""
+        co = np.asarray(co, dtype=np.float64)
+        dims = self.dims
+        k_lo = self._keys(co - radius)
+        k_hi = self._keys(co + radius)
+        starts = self.starts
+        chunks = []
+        for x in range(k_lo[0], k_hi[0] + 1):
+            for y in range(k_lo[1], k_hi[1] + 1):
+                column = (x * dims[1] + y) * dims[2]
+                a = starts[column + k_lo[2]]
+                b = starts[column + k_hi[2] + 1]
+                if b > a:
+                    chunks.append(self.order[a:b])
+        if not chunks:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        indices = np.concatenate(chunks)
+        distances = np.sqrt(((self.co[indices] - co) ** 2).sum(axis=1))
+        mask = distances <= radius
+        indices = indices[mask]
+        distances = distances[mask]
+        sort = np.argsort(distances, kind="stable")
+        return indices[sort], distances[sort]
+
+    def find(self, co):
+        """Index and distance of the closest point, (-1, inf) without points."""
+        co = np.asarray(co, dtype=np.float64)
+        if not len(self.co):
+            return -1, float("inf")
+        radius = self.size
+        while True:
+            indices, distances = self.find_range(co, radius)
+            # Everything within the radius was searched, so the first is the closest.
+            if len(indices):
+                return int(indices[0]), float(distances[0])
+            radius *= 2.0
@@ -0,0 +1,49 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+import numpy as np
+
+
+def vert_islands(edges, verts_total):
+    """Connected part of each vertex of a mesh, from its (n, 2) or flat edge vertex indices.
+
+    Parts are numbered from 0 in the order of their lowest vertex index,
+    vertices without edges are parts of their own.
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    labels = np.arange(verts_total, dtype=np.int64)
+    if not len(edges):
+        return labels
+    while True:
+        # Both ends of each edge take the lowest label of the two...
+        edge_labels = np.minimum(labels[edges[:, 0]], labels[edges[:, 1]])
+        labels_new = labels.copy()
+        np.minimum.at(labels_new, edges[:, 0], edge_labels)
+        np.minimum.at(labels_new, edges[:, 1], edge_labels)
+        # ...then follow labels to the vertex they point to, until they point to themselves.
+        while True:
+            labels_next = labels_new[labels_new]
+            if np.array_equal(labels_next, labels_new):
+                break
+            labels_new = labels_next
+        if np.array_equal(labels_new, labels):
+            break
+        labels = labels_new
+    return np.unique(labels, return_inverse=True)[1]
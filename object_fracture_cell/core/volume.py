@@ -0,0 +1,38 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+import numpy as np
+
+from .spatial import transform
+
+
+def bound_box_volume(matrix, bound_box):
+    """Volume of the world space axis aligned box around an object's bound_box."""
+    co = transform(matrix, bound_box)
+    return float(np.prod(co.max(axis=0) - co.min(axis=0)))
+
+
+def mass_by_volume(volumes, mass):
+    """Split mass between objects by their volume, None when they have no volume."""
+    volumes = np.asarray(volumes, dtype=np.float64)
+    volume_tot = volumes.sum()
+    if volume_tot > 0.0:
+        return volumes * (mass / volume_tot)
+    return None
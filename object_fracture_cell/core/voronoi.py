@@ -0,0 +1,681 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+# Script copyright (C) Blender Foundation 2012
+
+import numpy as np
+
+from .cellset import CellSet
+from .polytope import ConvexCell
+from .sampling import random_points_in_planes
+from .spatial import (
+        PointGrid,
+        transform_planes,
+        )
+
+# Smallest cell scale, a zero scale can't be stretched back.
+SCALE_MIN = 1e-6
+
+
+def bounds_planes(xyz_min, xyz_max, margin_bounds=0.0):
+    """The six planes of a box, (x, y, z, scaler) as ConvexCell takes them."""
+    xmin, ymin, zmin = np.asarray(xyz_min, dtype=np.float64) - margin_bounds
+    xmax, ymax, zmax = np.asarray(xyz_max, dtype=np.float64) + margin_bounds
+    # Plane will be made at the perpendicular direction of the normal vector.
+    return np.array((
+        (+1.0, 0.0, 0.0, -xmax),
+        (-1.0, 0.0, 0.0, +xmin),
+        (0.0, +1.0, 0.0, -ymax),
+        (0.0, -1.0, 0.0, +ymin),
+        (0.0, 0.0, +1.0, -zmax),
+        (0.0, 0.0, -1.0, +zmin),
+        ))
+
+
+class _CellCalc:
+    """Voronoi cells of seeds, each one computed independently of the others."""
+
+    def __init__(self, points_co, planes, margin_cell=0.0, margin_axes=None, groups=None):
+        self.points_co = np.asarray(points_co, dtype=np.float64).reshape(-1, 3)
+        self.planes = np.asarray(planes, dtype=np.float64).reshape(-1, 4)
+        # (seed_groups, group_planes) when the seeds are independent groups,
+        # each seed is only cut by the seeds and planes of its own group.
+        self.groups = groups
+        self.margin_cell = margin_cell
+        # In stretched space the margin depends on the plane direction, see points_to_faces.
+        self.margin_axes = margin_axes
+        if margin_axes is not None:
+            self.margin_max = margin_cell * max(margin_axes)
+        else:
+            self.margin_max = margin_cell
+
+        # Build the spatial index once, neighbours are then visited
+        # in increasing distance from each seed.
+        self.grid = PointGrid(self.points_co)
+
+    def safety_radius(self, cell):
+        """Neighbours farther than this can't cut the cell any more."""
+        # A neighbour at distance d adds a plane at d / 2 from the seed (less the margin).
+        radius = np.sqrt(cell.radius_squared())
+        return 2.0 * (radius + self.margin_max)
+
+    def neighbour_planes(self, normal, distance):
+        """Planes between a seed and its neighbours, (normal, distance) relative to the seed."""
+        normal = normal / distance[:, np.newaxis]
+        planes = np.empty((len(normal), 4))
+        planes[:, :3] = normal
+        if self.margin_axes is not None:
+            margin = self.margin_cell * np.sqrt(((normal * self.margin_axes) ** 2).sum(axis=1))
+        else:
+            margin = self.margin_cell
+        planes[:, 3] = (-distance / 2.0) + margin
+        return planes
+
+    def cut(self, cell, point_current, indices, distances, plane_index):
+        """Cut the cell by the planes to neighbours, sorted by distance.
+
+        Returns the next plane index, None once farther neighbours can't cut the cell.
+        """
+        if not len(indices):
+            return plane_index
+        distance_limit = self.safety_radius(cell)
+        neighbour_planes = self.neighbour_planes(self.points_co[indices] - point_current, distances)
+        for plane, distance in zip(neighbour_planes.tolist(), distances.tolist()):
+            if distance > distance_limit:
+                return None
+            # Cut the cell by the plane between the points.
+            if not cell.cut(plane, plane_index):
+                return None
+            plane_index += 1
+            distance_limit = self.safety_radius(cell)
+        return plane_index
+
+    def cell(self, i):
+        points_co = self.points_co
+        grid = self.grid
+        point_current = points_co[i]
+        if self.groups is not None:
+            seed_groups, group_planes = self.groups
+            group = seed_groups[i]
+            planes = group_planes[group].copy()
+        else:
+            planes = self.planes.copy()
+
+        # Vertices are relative to the current point, so their farthest one is the cell's circumradius.
+        planes[:, 3] += planes[:, :3] @ point_current
+        cell = ConvexCell(planes.tolist())
+        plane_index = len(planes)
+
+        # Grow the search radius until the cell can't be cut by anything farther.
+        radius_prev = -1.0
+        radius = grid.size * 1.5
+        while cell:
+            indices, distances = grid.find_range(point_current, radius)
+            # Skip the ones done in the previous search, the current point and doubles.
+            mask = distances > max(radius_prev, 0.0)
+            if self.groups is not None:
+                mask &= seed_groups[indices] == group
+            plane_index = self.cut(cell, point_current, indices[mask], distances[mask], plane_index)
+            if plane_index is None or grid.covers(point_current, radius):
+                break
+            distance_limit = self.safety_radius(cell)
+            if distance_limit <= radius:
+                break
+            radius_prev = radius
+            radius = min(radius * 2.0, distance_limit)
+
+        return cell
+
+    def cells(self, indices):
+        """CellSet of the non-empty cells, centers are left to the caller."""
+        def polytopes():
+            for i in indices:
+                cell = self.cell(i)
+                if cell:
+                    yield i, cell.verts, cell.faces, cell.face_planes
+        return CellSet.from_polytopes(polytopes())
+
+
+# Set in each worker process by _pool_init, so the seeds are sent once per worker, not per task.
+_pool_cell_calc = None
+
+
+def _pool_init(*args):
+    global _pool_cell_calc
+    _pool_cell_calc = _CellCalc(*args)
+
+
+def _pool_cells(indices):
+    return _pool_cell_calc.cells(indices)
+
+
+# Whether SciPy imports, None until first asked.
+_scipy_available = None
+
+
+def voronoi_available():
+    """Whether the 'VORONOI' backend can run here, it needs SciPy (not bundled with Blender)."""
+    global _scipy_available
+    if _scipy_available is None:
+        try:
+            import scipy.spatial
+        except ImportError:
+            _scipy_available = False
+        else:
+            _scipy_available = True
+    return _scipy_available
+
+
+def processes_available():
+    """Whether cells can be computed in worker processes here.
+
+    Only Linux forks safely: on macOS forking a multithreaded process (Blender) can
+    crash or hang the workers, and spawned ones would have to import the add-on, which needs bpy.
+    """
+    import sys
+    return sys.platform.startswith("linux")
+
+
+def _ridge_loops(vor):
+    """Vertex loops of the ridges, their normals pointing from the first seed of each ridge to the second.
+
+    Returns (loops, loop_starts, loop_totals), ridges going to infinity are left as they are.
+    """
+    from itertools import chain
+    loop_totals = np.array([len(ridge) for ridge in vor.ridge_vertices], dtype=np.int64)
+    loops = np.fromiter(chain.from_iterable(vor.ridge_vertices), dtype=np.int64, count=loop_totals.sum())
+    loop_starts = np.concatenate(([0], np.cumsum(loop_totals)[:-1]))
+    loop_ridges = np.repeat(np.arange(len(loop_totals)), loop_totals)
+
+    # Sort the vertices of each ridge by their angle around its normal, like ConvexCell does its caps.
+    normals = vor.points[vor.ridge_points[:, 1]] - vor.points[vor.ridge_points[:, 0]]
+    normals /= np.sqrt((normals ** 2).sum(axis=1))[:, np.newaxis]
+    axis_u = np.where((np.abs(normals[:, 0]) < 0.9)[:, np.newaxis],
+                      np.stack((np.zeros(len(normals)), -normals[:, 2], normals[:, 1]), axis=1),
+                      np.stack((normals[:, 2], np.zeros(len(normals)), -normals[:, 0]), axis=1))
+    axis_v = np.cross(normals, axis_u)
+    co = vor.vertices[loops]
+    centers = np.add.reduceat(co, loop_starts) / loop_totals[:, np.newaxis]
+    co -= centers[loop_ridges]
+    angles = np.arctan2((co * axis_v[loop_ridges]).sum(axis=1), (co * axis_u[loop_ridges]).sum(axis=1))
+    finite = np.minimum.reduceat(loops, loop_starts) >= 0
+    angles[~finite[loop_ridges]] = 0.0
+    return loops[np.lexsort((angles, loop_ridges))], loop_starts, loop_totals
+
+
+def _margin_cuts(points_co, cellset, margin_cell, margin_axes=None):
+    """Seed ids of the cells that other seeds still cut, once the planes are moved in by the margin.
+
+    Seeds that aren't neighbours of a cell can cut it then, when they are close to the sphere
+    around one of its corners (nearly co-spherical seeds). A seed can only cut off a vertex
+    x of a cell when it is closer to it than |x| + 2 * margin.
+    """
+    from itertools import chain
+    from scipy.spatial import cKDTree
+
+    vert_cells = np.repeat(cellset.seed_ids, np.diff(cellset.vert_offsets))
+    co = cellset.verts.astype(np.float64)
+    lengths = np.sqrt((co ** 2).sum(axis=1))
+    margin_max = margin_cell * (max(margin_axes) if margin_axes is not None else 1.0)
+    found = cKDTree(points_co).query_ball_point(co + points_co[vert_cells],
+                                                lengths + 2.0 * margin_max + ConvexCell.EPSILON)
+    totals = np.array([len(seeds) for seeds in found], dtype=np.int64)
+    seeds = np.fromiter(chain.from_iterable(found), dtype=np.int64, count=totals.sum())
+    vert_index = np.repeat(np.arange(len(co)), totals)
+
+    normals = points_co[seeds] - points_co[vert_cells[vert_index]]
+    distances = np.sqrt((normals ** 2).sum(axis=1))
+    # The seed itself and its doubles don't cut its cell, like in _CellCalc.
+    mask = distances > 0.0
+    vert_index, normals, distances = vert_index[mask], normals[mask] / distances[mask, np.newaxis], distances[mask]
+    if margin_axes is not None:
+        margins = margin_cell * np.sqrt(((normals * margin_axes) ** 2).sum(axis=1))
+    else:
+        margins = margin_cell
+    # The vertices are single precision.
+    tolerance = ConvexCell.EPSILON * (1.0 + lengths[vert_index])
+    cuts = (normals * co[vert_index]).sum(axis=1) > distances / 2.0 - margins + tolerance
+    return np.unique(vert_cells[vert_index[cuts]])
+
+
+def _halfspace_polytope(planes, plane_indices):
+    """(verts, faces, face_planes) of the polytope of (n, 4) planes around the origin, by Qhull.
+
+    Faces are the planes with their index in plane_indices, as ConvexCell makes them.
+    None when Qhull can't be used: the origin isn't inside, or vertices are doubled.
+    """
+    from itertools import chain
+    from scipy.spatial import HalfspaceIntersection
+
+    eps = ConvexCell.EPSILON
+    if (planes[:, 3] > -eps).any():
+        return None
+    try:
+        polytope = HalfspaceIntersection(planes, np.zeros(3))
+    except (RuntimeError, ValueError):
+        return None
+    verts = polytope.intersections
+    if len(verts) < 4 or (np.sqrt(((verts[:, np.newaxis] - verts) ** 2).sum(axis=2)) +
+                          np.identity(len(verts)) <= eps).any():
+        return None
+
+    # The vertices on each plane, counter-clockwise around its normal.
+    totals = [len(facet) for facet in polytope.dual_facets]
+    vert_planes = np.fromiter(chain.from_iterable(polytope.dual_facets), dtype=np.int64, count=sum(totals))
+    vert_index = np.repeat(np.arange(len(verts)), totals)
+    normals = planes[vert_planes, :3]
+    axis_u = np.where((np.abs(normals[:, 0]) < 0.9)[:, np.newaxis],
+                      np.stack((np.zeros(len(normals)), -normals[:, 2], normals[:, 1]), axis=1),
+                      np.stack((normals[:, 2], np.zeros(len(normals)), -normals[:, 0]), axis=1))
+    axis_v = np.cross(normals, axis_u)
+    plane_used, plane_used_index, plane_totals = np.unique(vert_planes, return_inverse=True, return_counts=True)
+    centers = np.zeros((len(plane_used), 3))
+    np.add.at(centers, plane_used_index, verts[vert_index])
+    co = verts[vert_index] - centers[plane_used_index] / plane_totals[plane_used_index, np.newaxis]
+    angles = np.arctan2((co * axis_v).sum(axis=1), (co * axis_u).sum(axis=1))
+    order = np.lexsort((angles, vert_planes))
+    loops = np.split(vert_index[order], np.cumsum(plane_totals)[:-1])
+    # A plane only touching an edge or a vertex isn't a face.
+    faces = [loop.tolist() for loop in loops if len(loop) >= 3]
+    face_planes = plane_indices[plane_used[plane_totals >= 3]].tolist()
+    return verts.tolist(), faces, face_planes
+
+
+def _voronoi_cells(points_co, planes, margin_cell=0.0, margin_axes=None):
+    """Cells of all seeds at once, from their Voronoi diagram (needs SciPy).
+
+    A cell is made straight from its ridges when it is bounded and doesn't reach the planes,
+    with its vertices moved in along its faces for the margin. Cells that reach the planes,
+    or that a margin changes the shape of, start from their ridges and are cut by these planes only.
+    Returns (cellset, clip_indices): clip_indices are the other seeds, unbounded or
+    degenerate cells, for _CellCalc. Their ridges aren't enough to cut them: Qhull leaves out
+    some neighbours of seeds on the hull when these are on a plane, e.g. a lattice.
+    None when the seeds can't be triangulated (too few, or all on a plane).
+    """
+    from scipy.spatial import Voronoi
+
+    points_total = len(points_co)
+    if points_total < 5:
+        return None
+    try:
+        vor = Voronoi(points_co)
+    except (RuntimeError, ValueError):
+        # QhullError is a RuntimeError.
+        return None
+    ridge_loops, ridge_starts, ridge_totals = _ridge_loops(vor)
+    eps = ConvexCell.EPSILON
+
+    # Bounded cells of one seed (doubles share their region), the others are clipped.
+    regions_bounded = np.array([len(region) > 0 and -1 not in region for region in vor.regions])
+    point_region = vor.point_region
+    cell_ok = regions_bounded[point_region] & (np.bincount(point_region)[point_region] == 1)
+
+    # One face on each side of the ridges, reversed for the cell of the second seed.
+    face_cells = vor.ridge_points.T.ravel()
+    face_others = vor.ridge_points[:, ::-1].T.ravel()
+    face_ridges = np.tile(np.arange(len(vor.ridge_points)), 2)
+    face_flip = np.repeat((False, True), len(vor.ridge_points))
+    faces = np.flatnonzero(cell_ok[face_cells])
+    faces = faces[np.argsort(face_cells[faces], kind="stable")]
+    if not len(faces):
+        return CellSet.empty(), np.arange(points_total)
+    face_cells, face_others, face_ridges, face_flip = (
+            face_cells[faces], face_others[faces], face_ridges[faces], face_flip[faces])
+    face_totals = ridge_totals[face_ridges]
+
+    # Loops of all faces, with the global vertex index of each.
+    loop_faces = np.repeat(np.arange(len(faces)), face_totals)
+    face_loop_starts = np.concatenate(([0], np.cumsum(face_totals)[:-1]))
+    loop_side = np.arange(face_totals.sum()) - face_loop_starts[loop_faces]
+    loop_side = np.where(face_flip[loop_faces], face_totals[loop_faces] - 1 - loop_side, loop_side)
+    loop_verts = ridge_loops[ridge_starts[face_ridges][loop_faces] + loop_side]
+    loop_cells = face_cells[loop_faces]
+    loop_next = np.arange(len(loop_verts)) + 1
+    loop_next[face_loop_starts + face_totals - 1] = face_loop_starts
+
+    # The vertices of each cell, in order of cell.
+    vert_keys, loops = np.unique(loop_cells * len(vor.vertices) + loop_verts, return_inverse=True)
+    vert_cells = vert_keys // len(vor.vertices)
+    co_cell = vor.vertices[vert_keys % len(vor.vertices)] - points_co[vert_cells]
+    cells, vert_starts = np.unique(vert_cells, return_index=True)
+
+    # Degenerate cells are clipped, e.g. the ones of co-spherical seeds have edges of no length.
+    cell_ok[face_cells[face_totals < 3]] = False
+    edges = co_cell[loops[loop_next]] - co_cell[loops]
+    edges_length = np.sqrt((edges ** 2).sum(axis=1))
+    cell_ok[loop_cells[edges_length <= eps]] = False
+
+    co = co_cell
+    cell_recut = np.zeros(points_total, dtype=bool)
+    if margin_cell:
+        normals = points_co[face_others] - points_co[face_cells]
+        distances = np.sqrt((normals ** 2).sum(axis=1))
+        normals /= distances[:, np.newaxis]
+        if margin_axes is not None:
+            margins = margin_cell * np.sqrt(((normals * margin_axes) ** 2).sum(axis=1))
+        else:
+            margins = np.full(len(normals), float(margin_cell))
+        face_planes_margin = np.empty((len(normals), 4))
+        face_planes_margin[:, :3] = normals
+        face_planes_margin[:, 3] = -distances / 2.0 + margins
+
+        # Each vertex moves along the three faces it is on, this keeps the shape of the cell
+        # as long as no edge gets reversed. Else the cell is cut by its faces moved in.
+        vert_faces_total = np.bincount(loops, minlength=len(vert_keys))
+        cell_recut[vert_cells[vert_faces_total != 3]] = True
+        vert_faces = loop_faces[np.argsort(loops, kind="stable")]
+        vert_faces_start = np.concatenate(([0], np.cumsum(vert_faces_total)[:-1]))
+        vert_faces = vert_faces[np.minimum(vert_faces_start[:, np.newaxis] + np.arange(3), len(vert_faces) - 1)]
+        matrices = normals[vert_faces]
+        singular = np.abs(np.linalg.det(matrices)) < eps
+        cell_recut[vert_cells[singular]] = True
+        matrices[singular] = np.identity(3)
+        co = co_cell - np.linalg.solve(matrices, margins[vert_faces][:, :, np.newaxis])[:, :, 0]
+        edges_margin = co[loops[loop_next]] - co[loops]
+        cell_recut[loop_cells[(edges_margin * edges).sum(axis=1) <= eps * edges_length]] = True
+        co = np.where(cell_recut[vert_cells][:, np.newaxis], co_cell, co)
+
+    # Cells away from the planes are done.
+    plane_dist = (co + points_co[vert_cells]) @ planes[:, :3].T + planes[:, 3]
+    cell_inside = np.ones(points_total, dtype=bool)
+    cell_inside[vert_cells[(plane_dist >= -eps).any(axis=1)]] = False
+
+    cell_faces_offsets = np.concatenate(([0], np.cumsum(np.bincount(face_cells, minlength=points_total)[cells])))
+    cellset = CellSet(co,
+                      np.append(vert_starts, len(co)),
+                      loops - vert_starts[np.searchsorted(cells, loop_cells)],
+                      np.append(face_loop_starts, len(loops)),
+                      cell_faces_offsets,
+                      np.zeros((len(cells), 3)),
+                      cells)
+    cells_ok = cell_ok[cells]
+    cells_done = cells_ok & cell_inside[cells] & ~cell_recut[cells]
+
+    def polytopes():
+        # Plane indices past the planes, like the ones of the neighbours in _CellCalc.
+        plane_index_cell = len(planes)
+        for i in np.flatnonzero(cells_ok & ~cells_done).tolist():
+            seed_id = int(cells[i])
+            cell_planes = planes.copy()
+            cell_planes[:, 3] += cell_planes[:, :3] @ points_co[seed_id]
+            if cell_recut[seed_id]:
+                face_start, face_end = cell_faces_offsets[i:i + 2]
+                polytope = _halfspace_polytope(np.concatenate((face_planes_margin[face_start:face_end], cell_planes)),
+                                               np.concatenate((np.full(face_end - face_start, plane_index_cell),
+                                                               np.arange(len(cell_planes)))))
+                if polytope is not None:
+                    if polytope[1]:
+                        yield (seed_id, *polytope)
+                    continue
+            faces = cellset.cell_faces(i)
+            cell = ConvexCell.from_polytope(cellset.cell_verts(i).tolist(), faces, [-1] * len(faces))
+            if cell_recut[seed_id]:
+                for plane in face_planes_margin[face_start:face_end].tolist():
+                    if not cell.cut(plane, plane_index_cell):
+                        break
+            for plane_index, plane in enumerate(cell_planes.tolist()):
+                if not cell:
+                    break
+                cell.cut(plane, plane_index)
+            if cell:
+                yield seed_id, cell.verts, cell.faces, cell.face_planes
+
+    cellset = CellSet.concatenate((cellset.take(np.flatnonzero(cells_done)), CellSet.from_polytopes(polytopes())))
+    if margin_cell and len(cellset):
+        cuts = _margin_cuts(points_co, cellset, margin_cell, margin_axes)
+        cell_ok[cuts] = False
+        cellset = cellset.take(np.flatnonzero(cell_ok[cellset.seed_ids]))
+    return cellset, np.flatnonzero(~cell_ok)
+
+
+def _cells_parallel(processes, points_co, *args, indices=None):
+    """Split the seeds in chunks over worker processes, the result keeps the order of the seeds."""
+    import multiprocessing
+    # Workers are forked so they share the seeds in memory, spawned ones
+    # would have to import the add-on package, which needs bpy.
+    context = multiprocessing.get_context("fork")
+    if indices is None:
+        indices = range(len(points_co))
+    points_total = len(indices)
+    chunk_size = max(16, points_total // (processes * 8))
+    chunks = [indices[i:i + chunk_size] for i in range(0, points_total, chunk_size)]
+    with context.Pool(processes, initializer=_pool_init, initargs=(points_co, *args)) as pool:
+        cellsets = pool.map(_pool_cells, chunks, chunksize=1)
+    return CellSet.concatenate(cellsets)
+
+
+def _cells(processes, points_co, *args, indices=None):
+    """CellSet of all seeds, or the given ones, by _CellCalc, in worker processes when worth it."""
+    if processes == 0:
+        import os
+        processes = os.cpu_count() or 1
+    if not processes_available():
+        processes = 1
+    # Not worth starting processes for a few cells.
+    if indices is None:
+        indices = range(len(points_co))
+    if processes > 1 and len(indices) >= 64 * processes:
+        return _cells_parallel(processes, points_co, *args, indices=indices)
+    return _CellCalc(points_co, *args).cells(indices)
+
+
+def _cells_voronoi(processes, points_co, planes, margin_cell=0.0, margin_axes=None):
+    """CellSet of all seeds from their Voronoi diagram, the cells it can't make by _CellCalc."""
+    cells_voronoi = _voronoi_cells(points_co, planes, margin_cell, margin_axes)
+    if cells_voronoi is None:
+        return _cells(processes, points_co, planes, margin_cell, margin_axes)
+    cellset, clip_indices = cells_voronoi
+    cellset = CellSet.concatenate((cellset, _cells(processes, points_co, planes, margin_cell, margin_axes,
+                                                   indices=clip_indices)))
+    return cellset.take(np.argsort(cellset.seed_ids, kind="stable"))
+
+
+def _cell_planes(xyz_min, xyz_max, margin_bounds, planes=None, clip_planes=None):
+    """Planes bounding the cells, with the range of the clip planes in them."""
+    # The bounding box is always used, other planes only make cells smaller.
+    if planes is not None and len(planes):
+        planes = np.array(planes, dtype=np.float64).reshape(-1, 4)
+        planes[:, 3] -= margin_bounds
+        planes = np.concatenate((bounds_planes(xyz_min, xyz_max, margin_bounds), planes))
+    else:
+        planes = bounds_planes(xyz_min, xyz_max, margin_bounds)
+    clip_start = len(planes)
+    if clip_planes is not None and len(clip_planes):
+        planes = np.concatenate((planes, np.asarray(clip_planes, dtype=np.float64).reshape(-1, 4)))
+    return planes, clip_start, len(planes)
+
+
+def _stretch(points_scale):
+    """Stretch of the seeds for scaled cells, None when the cells aren't scaled.
+
+    Scaled cells are the Voronoi cells of the seeds stretched by sqrt(points_scale):
+    both have the bisector planes through the midpoints, with normals scaled by points_scale.
+    So everything is stretched once, and the cell vertices are scaled back at the end.
+    """
+    if points_scale is None or tuple(points_scale) == (1.0, 1.0, 1.0):
+        return None
+    return np.sqrt(np.maximum(points_scale, SCALE_MIN))
+
+
+def _stretch_apply(stretch, points_co, planes_list):
+    if stretch is None:
+        return points_co, planes_list
+    matrix = np.diag((*stretch, 1.0))
+    return points_co * stretch, [transform_planes(matrix, planes) for planes in planes_list]
+
+
+def _stretch_undo(stretch, cellset, seeds_co):
+    if stretch is not None:
+        cellset.verts /= stretch
+    cellset.centers = seeds_co[cellset.seed_ids]
+
+
+def _cellset_tag(cellset, clip_start, clip_end, sources=None):
+    """Plane indices relative to the clip planes (-1 for others), and the source of each cell"""
+    face_planes = cellset.face_planes
+    cellset.face_planes = np.where((face_planes >= clip_start) & (face_planes < clip_end),
+                                   face_planes - clip_start, -1).astype(np.int32)
+    if sources is not None:
+        source_names, seed_sources = np.unique(np.asarray(sources), return_inverse=True)
+        cellset.source_names = tuple(source_names.tolist())
+        cellset.seed_sources = seed_sources.astype(np.int16)[cellset.seed_ids]
+
+
+def points_to_cellset(points_co, xyz_min, xyz_max,
+                      points_scale=None,
+                      margin_bounds=0.05,
+                      margin_cell=0.0,
+                      processes=1,
+                      backend='GRID',
+                      planes=None,
+                      sources=None,
+                      clip_planes=None):
+    """Voronoi cells of (n, 3) seeds, clipped to a box and (m, 4) planes when given.
+
+    Returns a CellSet of the non-empty cells, with vertices relative to the seed
+    and one face per plane, normals pointing out of the cell.
+    sources are the tags of the seeds, e.g. 'VERTS', kept for each cell.
+
+    processes > 1 computes the cells in that many worker processes, 0 uses all CPU cores.
+    Only on Linux, elsewhere the cells are computed here.
+
+    backend 'GRID' cuts each cell by the seeds around it, 'VORONOI' makes the cells
+    of all seeds at once from their Voronoi diagram (needs SciPy, see voronoi_available),
+    it falls back to 'GRID' for seeds Qhull can't take (fewer than 5, or all on a plane).
+
+    planes are tighter bounds than the box, e.g. the hull of the original,
+    pushed out by margin_bounds like the box.
+
+    clip_planes cut the cells exactly, e.g. the faces of a convex original,
+    face_planes of the cells are the index in clip_planes of the faces on them.
+    """
+    points_co = np.asarray(points_co, dtype=np.float64).reshape(-1, 3)
+    if not len(points_co):
+        return CellSet.empty()
+    seeds_co = points_co
+
+    planes, clip_start, clip_end = _cell_planes(xyz_min, xyz_max, margin_bounds, planes, clip_planes)
+    stretch = _stretch(points_scale)
+    points_co, (planes,) = _stretch_apply(stretch, points_co, (planes,))
+
+    if backend == 'VORONOI':
+        cellset = _cells_voronoi(processes, points_co, planes, margin_cell, stretch)
+    else:
+        cellset = _cells(processes, points_co, planes, margin_cell, stretch)
+
+    _stretch_undo(stretch, cellset, seeds_co)
+    _cellset_tag(cellset, clip_start, clip_end, sources)
+    return cellset
+
+
+def groups_to_cellsets(groups_co, groups_min, groups_max,
+                       points_scale=None,
+                       margin_bounds=0.05,
+                       margin_cell=0.0,
+                       processes=1,
+                       groups_planes=None,
+                       groups_sources=None,
+                       groups_clip_planes=None):
+    """Voronoi cells of groups of seeds in one pass, as points_to_cellset would make for each group.
+
+    Each group has its own (n, 3) seeds, box, planes, sources and clip planes (None when not used).
+    Seeds only cut the cells of their own group, so groups may overlap,
+    e.g. the seeds of the cells of one recursion level. Returns a CellSet per group.
+    """
+    groups_total = len(groups_co)
+    groups_co = [np.asarray(co, dtype=np.float64).reshape(-1, 3) for co in groups_co]
+    if groups_planes is None:
+        groups_planes = [None] * groups_total
+    if groups_clip_planes is None:
+        groups_clip_planes = [None] * groups_total
+    points_co = np.concatenate(groups_co) if groups_total else np.zeros((0, 3))
+    seed_groups = np.repeat(np.arange(groups_total), [len(co) for co in groups_co])
+    if not len(points_co):
+        return [CellSet.empty() for _ in range(groups_total)]
+
+    group_planes = []
+    clip_ranges = []
+    for xyz_min, xyz_max, planes, clip_planes in zip(groups_min, groups_max, groups_planes, groups_clip_planes):
+        planes, clip_start, clip_end = _cell_planes(xyz_min, xyz_max, margin_bounds, planes, clip_planes)
+        group_planes.append(planes)
+        clip_ranges.append((clip_start, clip_end))
+
+    seeds_co = points_co
+    stretch = _stretch(points_scale)
+    points_co, group_planes = _stretch_apply(stretch, points_co, group_planes)
+
+    cellset = _cells(processes, points_co, np.zeros((0, 4)), margin_cell, stretch,
+                     (seed_groups, group_planes))
+    _stretch_undo(stretch, cellset, seeds_co)
+    cell_groups = seed_groups[cellset.seed_ids]
+
+    cellsets = []
+    group_offsets = np.concatenate(([0], np.cumsum([len(co) for co in groups_co])))
+    for group in range(groups_total):
+        group_cellset = cellset.take(np.flatnonzero(cell_groups == group))
+        # Seed ids and plane indices as points_to_cellset gives them for this group alone.
+        group_cellset.seed_ids -= group_offsets[group]
+        _cellset_tag(group_cellset, *clip_ranges[group],
+                     groups_sources[group] if groups_sources is not None else None)
+        cellsets.append(group_cellset)
+    return cellsets
+
+
+def subdivide_cells(cellset, indices, points_total,
+                    points_scale=None,
+                    margin_cell=0.0):
+    """Break the given cells of a CellSet again, by the Voronoi cells of random seeds inside each.
+
+    The children are clipped exactly to their parent, so they tile it like the cells
+    tile the original, and keep its seed, source and clip plane of each face.
+    Returns a CellSet of the other cells followed by the children of each cell,
+    in the order of indices. Cells that don't get two seeds are kept whole.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    keep = np.ones(len(cellset), dtype=bool)
+    cellsets = []
+    for i in indices.tolist():
+        verts = cellset.cell_verts(i).astype(np.float64)
+        xyz_min, xyz_max = verts.min(axis=0), verts.max(axis=0)
+        planes = cellset.cell_planes(i)
+        points_co = random_points_in_planes(xyz_min, xyz_max, planes, points_total)
+        if len(points_co) < 2:
+            continue
+        # The box must not touch the parent faces, or children faces on them lose their plane.
+        children = points_to_cellset(points_co, xyz_min, xyz_max,
+                                     points_scale,
+                                     margin_bounds=0.01 * float((xyz_max - xyz_min).max()) + 1e-6,
+                                     margin_cell=margin_cell,
+                                     clip_planes=planes)
+        if not len(children):
+            continue
+        face_start, face_end = cellset.cell_face_offsets[i:i + 2]
+        parent_face_planes = cellset.face_planes[face_start:face_end]
+        children.face_planes = np.where(children.face_planes >= 0,
+                                        parent_face_planes[np.maximum(children.face_planes, 0)],
+                                        -1).astype(np.int32)
+        children.centers += cellset.centers[i]
+        children.seed_ids[:] = cellset.seed_ids[i]
+        children.seed_sources[:] = cellset.seed_sources[i]
+        children.source_names = cellset.source_names
+        keep[i] = False
+        cellsets.append(children)
+    return CellSet.concatenate([cellset.take(np.flatnonzero(keep))] + cellsets)
+
@@ -2,12 +2,14 @@
 if "bpy" in locals():
     import importlib
     importlib.reload(cell_main)
+    importlib.reload(cell_functions)
     importlib.reload(crack_functions)
     importlib.reload(material_functions)
     importlib.reload(utilities)
 
 else:
     from .process import cell_main
+    from .process import cell_functions
     from .process import crack_functions
     from .process import material_functions
     from . import utilities
@@ -29,6 +31,12 @@ class FRACTURE_OT_Cell(Operator):
       
         fracture_cell_props = context.window_manager.fracture_cell_props
         cell_keywords = utilities._cell_props_to_dict(fracture_cell_props)
+        if cell_keywords["cell_backend"] != 'GRID':
+            from .core import voronoi
+            if not voronoi.voronoi_available():
+                # e.g. set in a file saved where SciPy was installed.
+                self.report({'WARNING'}, "Voronoi backend needs SciPy, computing the cells one by one")
+                cell_keywords["cell_backend"] = 'GRID'
         
         originals = context.selected_editable_objects       
         for original in originals:
@@ -57,6 +65,9 @@ class FRACTURE_OT_Cell(Operator):
         row.prop(cell_props, "source_vert_child")
         row.prop(cell_props, "source_particle_child")
         row.prop(cell_props, "source_pencil")
+        row = col.row()
+        row.enabled = cell_props.source_random > 0
+        row.prop(cell_props, "source_random_bounds")
         
         box = layout.box()
         col = box.column()
@@ -69,6 +80,17 @@ class FRACTURE_OT_Cell(Operator):
         
         row.prop(cell_props, "cell_scale")
         row.prop(cell_props, "use_recenter")
+        row = col.row()
+        from .core import voronoi
+        sub = row.row()
+        # Does nothing where workers can't be forked.
+        sub.enabled = voronoi.processes_available()
+        sub.prop(cell_props, "cell_processes")
+        row.prop(cell_props, "cell_backend")
+        row.prop(cell_props, "cell_bounds")
+        row.prop(cell_props, "cell_engine")
+        row = col.row()
+        row.prop(cell_props, "boolean_workers")
         # could be own section, control how we subdiv
         #row.prop(cell_props, "use_island_split")
 
@@ -78,6 +100,7 @@ class FRACTURE_OT_Cell(Operator):
         row = col.row(align=True)
         row.alignment = 'LEFT'
         row.prop(cell_props, "recursion")
+        row.prop(cell_props, "recursion_mode", text="")
         row = col.row(align=True)
         row.alignment = 'LEFT'
         if cell_props.recursion > 0:
@@ -88,6 +111,12 @@ class FRACTURE_OT_Cell(Operator):
         row.prop(cell_props, "recursion_clamp")
         row.prop(cell_props, "recursion_chance")      
         row.prop(cell_props, "recursion_chance_select")#, expand=True)
+        row = col.row(align=True)
+        row.alignment = 'LEFT'
+        row.enabled = cell_props.recursion > 0
+        row.prop(cell_props, "recursion_time_limit")
+        row.prop(cell_props, "recursion_poly_limit")
+        row.prop(cell_props, "recursion_memory_limit")
 
         box = layout.box()
         col = box.column()
@@ -129,6 +158,7 @@ class FRACTURE_OT_Cell(Operator):
         row.alignment = 'LEFT'
         row.prop(cell_props, "original_hide")
         row.prop(cell_props, "cell_relocate")
+        row.prop(cell_props, "cell_output")
         row = col.row(align=True)
         row.prop(cell_props, "use_collection")
         if cell_props.use_collection:
@@ -235,6 +265,51 @@ class FRACTURE_OT_Crack(Operator):
         row.prop(crack_props, "modifier_wireframe")
                 
         
+class FRACTURE_OT_Explode(Operator):
+    bl_idname = "object.fracture_cell_explode"
+    bl_label = "Explode Packed Cells"
+    bl_description = "Move cells of a packed cell object into their own objects"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    use_selected: bpy.props.BoolProperty(
+            name="Selected Faces Only",
+            description="Only explode the cells with selected faces, otherwise all cells",
+            default=True,
+            )
+
+    @classmethod
+    def poll(cls, context):
+        obj = context.active_object
+        return (obj is not None and obj.type == 'MESH' and
+                obj.data.polygon_layers_int.get("cell_id") is not None and
+                "cell_centers" in obj)
+
+    def execute(self, context):
+        packed = context.active_object
+        if packed.mode == 'EDIT':
+            # Face selection is only written to the mesh when leaving edit mode.
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        cell_ids = None
+        if self.use_selected:
+            mesh = packed.data
+            select = [False] * len(mesh.polygons)
+            mesh.polygons.foreach_get("select", select)
+            face_cells = [0] * len(mesh.polygons)
+            mesh.polygon_layers_int["cell_id"].data.foreach_get("value", face_cells)
+            cell_ids = {cell_id for cell_id, is_select in zip(face_cells, select) if is_select}
+            if not cell_ids:
+                self.report({'WARNING'}, "No faces selected")
+                return {'CANCELLED'}
+
+        cells = cell_functions.packed_explode(context, packed, cell_ids)
+
+        bpy.ops.object.select_all(action='DESELECT')
+        for cell in cells:
+            cell.select_set(True)
+        return {'FINISHED'}
+
+
 class FRACTURE_OT_Material(Operator):
     bl_idname = "object.add_fracture_material"
     bl_label = "Material Preset"
@@ -0,0 +1,73 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+# Background boolean worker, started by cell_functions.cells_boolean_workers:
+#
+#   blender --background --factory-startup --python cell_boolean_worker.py -- \
+#       ADDONS_DIR PACKAGE FILE_IN FILE_OUT CLEAN REMOVE_DOUBLES OPERAND CELL [OPERAND CELL ...]
+#
+# Reads the operands and cells from FILE_IN, intersects each cell with its
+# operand like cell_boolean does and writes the result meshes to FILE_OUT,
+# each with its index in the cells as a "cell_index" property.
+
+import importlib
+import sys
+
+import bpy
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:]
+    addons_dir, package, filepath_in, filepath_out, clean, remove_doubles = argv[:6]
+    operand_names = argv[6::2]
+    cell_names = argv[7::2]
+
+    sys.path.append(addons_dir)
+    cell_functions = importlib.import_module(package + ".process.cell_functions")
+
+    operand_names_unique = sorted(set(operand_names))
+    with bpy.data.libraries.load(filepath_in) as (data_from, data_to):
+        data_to.objects = operand_names_unique + cell_names
+    # Loaded names may change, find them by their place in the list.
+    operands = dict(zip(operand_names_unique, data_to.objects))
+    operands = [operands[operand_name] for operand_name in operand_names]
+    cells = data_to.objects[len(operand_names_unique):]
+
+    collection = bpy.context.scene.collection
+    for cell in cells:
+        collection.objects.link(cell)
+
+    cell_functions.cells_boolean_apply(bpy.context, operands, cells,
+                                       clean=bool(int(clean)),
+                                       remove_doubles=bool(int(remove_doubles)))
+
+    meshes = set()
+    for i, cell in enumerate(cells):
+        mesh = cell.data
+        mesh["cell_index"] = i
+        # Keep the slots but not the materials, so they aren't loaded back as copies.
+        for slot_index in range(len(mesh.materials)):
+            mesh.materials[slot_index] = None
+        meshes.add(mesh)
+    bpy.data.libraries.write(filepath_out, meshes)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,15 @@
 import bpy
 import bmesh
+import numpy as np
+
+from ..core import (
+        sampling,
+        spatial,
+        topology,
+        volume,
+        voronoi,
+        )
+from ..core.cellset import CellSet
 
 
 def _redraw_yasiamevil():
@@ -8,11 +18,11 @@ _redraw_yasiamevil.opr = bpy.ops.wm.redraw_timer
 _redraw_yasiamevil.arg = dict(type='DRAW_WIN_SWAP', iterations=1)
 
 def _limit_source(points, source_limit):
-    if source_limit != 0 and source_limit < len(points):
-        import random
-        random.shuffle(points)
-        points[source_limit:] = []
-        return points
+    """At most source_limit of the (points_co, points_source) points, picked at random"""
+    points_co, points_source = points
+    if source_limit != 0 and source_limit < len(points_co):
+        indices = np.sort(np.random.choice(len(points_co), source_limit, replace=False))
+        return points_co[indices], points_source[indices]
     else:
         return points
 
@@ -30,46 +40,402 @@ def desimplify_original(original):
         bpy.ops.object.modifier_remove(modifier='DECIMATE_crackit_original')
 
 def original_minmax(original_verts):
-    xa = [v[0] for v in original_verts]
-    ya = [v[1] for v in original_verts]
-    za = [v[2] for v in original_verts]
-    xmin, xmax = min(xa), max(xa)
-    ymin, ymax = min(ya), max(ya)
-    zmin, zmax = min(za), max(za)
+    (xmin, ymin, zmin), (xmax, ymax, zmax) = spatial.minmax(original_verts)
     return {"x":(xmin,xmax), "y":(ymin,ymax), "z":(zmin,zmax)}
 
+def _point_inside(bvh, co, step=1e-5, hits_max=1000):
+    """Point in mesh test, counting the surfaces a ray crosses.
+
+    step moves the ray past each surface it hits, it should follow the size of the mesh.
+    """
+    from mathutils import Vector
+    # Slanted, so the ray is unlikely to run along edges of axis aligned meshes.
+    direction = Vector((0.2, 0.3, 0.9)).normalized()
+    co = Vector(co)
+    hits = 0
+    index_prev = -1
+    for _ in range(hits_max):
+        location, normal, index, distance = bvh.ray_cast(co, direction)
+        if location is None:
+            break
+        # The face just passed is found again when the step is lost in float precision.
+        if index != index_prev:
+            hits += 1
+        index_prev = index
+        # Far from the origin a fixed step is below float32 precision and the ray stays put.
+        co = location + direction * max(step, 1e-6 * max(abs(a) for a in location))
+    return hits % 2 == 1
+
+
+def _point_inside_step(xyz_min, xyz_max):
+    """Step of _point_inside for a mesh in these bounds"""
+    xyz_min, xyz_max = np.asarray(xyz_min, dtype=np.float64), np.asarray(xyz_max, dtype=np.float64)
+    return max(float(np.sqrt(((xyz_max - xyz_min) ** 2).sum())) * 1e-6, 1e-9)
+
+
+def cells_classify(bvh, cellset):
+    """Cells entirely inside and entirely outside the original, as two boolean arrays.
+
+    Other cells straddle the surface of the original and need the boolean.
+    """
+    from mathutils import Vector
+    cells_total = len(cellset)
+    inside = np.zeros(cells_total, dtype=bool)
+    outside = np.zeros(cells_total, dtype=bool)
+    if not cells_total:
+        return inside, outside
+    radii = cellset.radii()
+    step = _point_inside_step((cellset.centers - radii[:, np.newaxis]).min(axis=0),
+                              (cellset.centers + radii[:, np.newaxis]).max(axis=0))
+    for i, (center, radius) in enumerate(zip(cellset.centers.tolist(), radii.tolist())):
+        # No surface within the sphere around the cell, it's all on one side.
+        location = bvh.find_nearest(Vector(center), radius * 1.001 + 1e-6)[0]
+        if location is None:
+            if _point_inside(bvh, center, step):
+                inside[i] = True
+            else:
+                outside[i] = True
+    return inside, outside
+
+
+def points_in_volume(bvh, xyz_min, xyz_max, count, voxels=4096, tries=8):
+    """Up to (count, 3) points uniformly distributed inside a closed mesh, from its BVH.
+
+    The box is split in voxels first, those away from the surface are all inside
+    or outside: points are only drawn in the others, and only tested one by one
+    in the voxels the surface crosses.
+    """
+    from mathutils import Vector
+    xyz_min = np.asarray(xyz_min, dtype=np.float64)
+    xyz_max = np.asarray(xyz_max, dtype=np.float64)
+    extent = xyz_max - xyz_min
+    if count <= 0 or extent.min() <= 0.0:
+        # Flat, nothing is inside.
+        return np.zeros((0, 3))
+    size = (extent.prod() / voxels) ** (1.0 / 3.0)
+    res = np.maximum(np.ceil(extent / size), 1).astype(np.int64)
+    step = extent / res
+    voxel_min = xyz_min + np.indices(res).reshape(3, -1).T * step
+    radius = float(np.sqrt((step ** 2).sum())) * 0.5 * 1.001
+    ray_step = _point_inside_step(xyz_min, xyz_max)
+
+    # 1 inside, 0 crossed by the surface, -1 outside.
+    state = np.zeros(len(voxel_min), dtype=np.int8)
+    for i, center in enumerate((voxel_min + step * 0.5).tolist()):
+        if bvh.find_nearest(Vector(center), radius)[0] is None:
+            state[i] = 1 if _point_inside(bvh, center, ray_step) else -1
+    voxel_index = np.flatnonzero(state >= 0)
+    if not len(voxel_index):
+        return np.zeros((0, 3))
+
+    points = []
+    points_total = 0
+    for _ in range(tries):
+        # Voxels are the same size, so picking one then a point in it is uniform.
+        voxel = voxel_index[np.random.randint(len(voxel_index), size=2 * (count - points_total) + 8)]
+        co = voxel_min[voxel] + np.random.random((len(voxel), 3)) * step
+        inside = state[voxel] == 1
+        for i in np.flatnonzero(~inside).tolist():
+            inside[i] = _point_inside(bvh, co[i], ray_step)
+        points.append(co[inside])
+        points_total += int(inside.sum())
+        if points_total >= count:
+            break
+    return np.concatenate(points)[:count]
+
+
+# More face planes than this is no prop, the boolean is cheaper than cutting each cell by all of them.
+CONVEX_PLANES_MAX = 256
+
+
+def original_convex(original, use_data_match=False, use_hide=False):
+    """Face planes of a convex original, and the material, smooth, hide and UVs
+    of its faces on each plane. None when it isn't closed and convex.
+
+    Cells are then clipped by the planes instead of a boolean.
+    """
+    mesh = original.data
+    polygons_total = len(mesh.polygons)
+    loops_total = len(mesh.loops)
+    if polygons_total < 4:
+        return None
+    # Vertex colors can't be interpolated from a plane.
+    if use_data_match and len(mesh.vertex_colors):
+        return None
+
+    # Closed, each edge is used by two faces.
+    loop_edges = np.empty(loops_total, dtype=np.int32)
+    mesh.loops.foreach_get("edge_index", loop_edges)
+    if not (np.bincount(loop_edges, minlength=len(mesh.edges)) == 2).all():
+        return None
+
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+    mesh.vertices.foreach_get("co", co)
+    matrix = np.array(original.matrix_world)
+    co = spatial.transform(matrix, co)
+    normals = np.empty(polygons_total * 3, dtype=np.float64)
+    mesh.polygons.foreach_get("normal", normals)
+    centers = np.empty(polygons_total * 3, dtype=np.float64)
+    mesh.polygons.foreach_get("center", centers)
+    normals = normals.reshape(-1, 3)
+    planes = np.empty((polygons_total, 4))
+    planes[:, :3] = normals
+    planes[:, 3] = -(normals * centers.reshape(-1, 3)).sum(axis=1)
+    planes = spatial.transform_planes(matrix, planes)
+
+    # Coplanar faces share a plane.
+    _, plane_first, polygon_planes = np.unique(np.round(planes, 4), axis=0,
+                                               return_index=True, return_inverse=True)
+    polygon_planes = polygon_planes.ravel()
+    if len(plane_first) > CONVEX_PLANES_MAX:
+        return None
+    planes = planes[plane_first]
+    co_min, co_max = spatial.minmax(co)
+    epsilon = 1e-4 * max(np.linalg.norm(co_max - co_min), 1e-6)
+    if (co @ planes[:, :3].T + planes[:, 3]).max() > epsilon:
+        return None
+
+    convex = {"planes": planes}
+    # Faces on one plane must agree, the plane gives them to the cells.
+    for attr, dtype in (("material_index", np.int32), ("use_smooth", bool), ("hide", bool)):
+        values = np.empty(polygons_total, dtype=dtype)
+        mesh.polygons.foreach_get(attr, values)
+        if attr == "hide" and not use_hide:
+            values[:] = False
+        if (values != values[plane_first][polygon_planes]).any():
+            return None
+        convex[attr] = values[plane_first]
+
+    # UVs of each plane as an affine map of the location, (planes, 4, 2).
+    convex["uv_layers"] = {}
+    if use_data_match and len(mesh.uv_layers):
+        loop_totals = np.empty(polygons_total, dtype=np.int32)
+        mesh.polygons.foreach_get("loop_total", loop_totals)
+        loop_verts = np.empty(loops_total, dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_verts)
+        loop_planes = np.repeat(polygon_planes, loop_totals)
+        loop_co = np.hstack((co[loop_verts], np.ones((loops_total, 1))))
+        for uv_layer in mesh.uv_layers:
+            uv = np.empty(loops_total * 2, dtype=np.float64)
+            uv_layer.data.foreach_get("uv", uv)
+            uv = uv.reshape(-1, 2)
+            affine = np.zeros((len(planes), 4, 2))
+            for plane_index in range(len(planes)):
+                mask = loop_planes == plane_index
+                affine[plane_index] = np.linalg.lstsq(loop_co[mask], uv[mask], rcond=None)[0]
+                if np.abs(loop_co[mask] @ affine[plane_index] - uv[mask]).max() > 1e-4:
+                    # Not a projection, e.g. unwrapped in pieces, leave it to the boolean.
+                    return None
+            convex["uv_layers"][uv_layer.name] = affine
+    return convex
+
+
+def original_planes(original, cell_bounds='BOX'):
+    """World space planes to clip the cells with, None for the bounding box only"""
+    if cell_bounds == 'ORIENTED':
+        # The object's own bound box, which turns with it.
+        co_min, co_max = spatial.minmax(original.bound_box)
+        return spatial.transform_planes(original.matrix_world, voronoi.bounds_planes(co_min, co_max))
+    elif cell_bounds == 'HULL':
+        bm = bmesh.new()
+        bm.from_mesh(original.data)
+        if len(bm.verts) < 4:
+            bm.free()
+            return None
+        try:
+            geom = bmesh.ops.convex_hull(bm, input=bm.verts)["geom"]
+        except RuntimeError:
+            import traceback
+            traceback.print_exc()
+            bm.free()
+            return None
+        hull_faces = [ele for ele in geom if isinstance(ele, bmesh.types.BMFace)]
+        bm.normal_update()
+        # The centroid of the hull vertices is inside the hull, the middle of the
+        # bound box may not be (thin rotated objects).
+        hull_verts = {v for bm_face in hull_faces for v in bm_face.verts}
+        if not hull_verts:
+            bm.free()
+            return None
+        center = tuple(np.mean([v.co[:] for v in hull_verts], axis=0).tolist())
+        planes = []
+        for bm_face in hull_faces:
+            normal = bm_face.normal
+            if normal.length_squared == 0.0:
+                continue
+            plane = [normal.x, normal.y, normal.z, -normal.dot(bm_face.verts[0].co)]
+            # Keep the hull on the inner side.
+            if plane[3] + normal.dot(center) > 0.0:
+                plane = [-a for a in plane]
+            planes.append(plane)
+        bm.free()
+        if not planes:
+            return None
+        return spatial.unique_planes(spatial.transform_planes(original.matrix_world, planes))
+    return None
+
+
+class OriginalCache:
+    """What the cells need of an original, worked out once for all of them.
+
+    An original with modifiers (e.g. pre_simplify's decimate) is evaluated
+    and baked into an operand object once, so the booleans don't evaluate
+    its modifiers again. The rest is made when first used.
+    Call free() once the run is done.
+    """
+
+    def __init__(self, context, original):
+        self.original = original
+        self.is_baked = bool(original.modifiers)
+        if self.is_baked:
+            depsgraph = context.evaluated_depsgraph_get()
+            mesh = bpy.data.meshes.new_from_object(original.evaluated_get(depsgraph))
+            # Not linked to the scene, the booleans still evaluate it.
+            self.operand = bpy.data.objects.new(name=original.name + "_operand", object_data=mesh)
+            self.operand.matrix_world = original.matrix_world
+            for i, slot_src in enumerate(original.material_slots):
+                if i < len(self.operand.material_slots):
+                    self.operand.material_slots[i].link = slot_src.link
+                    self.operand.material_slots[i].material = slot_src.material
+        else:
+            self.operand = original
+        self._verts = None
+        self._bvh = None
+        self._octree = None
+        self._convex = {}
+        self._planes = {}
+
+    def verts(self):
+        """(n, 3) world space vertices of the operand."""
+        if self._verts is None:
+            mesh = self.operand.data
+            co = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+            mesh.vertices.foreach_get("co", co)
+            self._verts = spatial.transform(np.array(self.operand.matrix_world), co)
+        return self._verts
+
+    def minmax(self):
+        return original_minmax(self.verts())
+
+    def bvh(self):
+        """World space BVH tree of the operand, to test cells against."""
+        if self._bvh is None:
+            from mathutils.bvhtree import BVHTree
+            polygons = [polygon.vertices[:] for polygon in self.operand.data.polygons]
+            self._bvh = BVHTree.FromPolygons(self.verts().tolist(), polygons)
+        return self._bvh
+
+    def convex(self, use_data_match=False, use_hide=False):
+        key = (use_data_match, use_hide)
+        if key not in self._convex:
+            self._convex[key] = original_convex(self.operand, use_data_match=use_data_match, use_hide=use_hide)
+        return self._convex[key]
+
+    def planes(self, cell_bounds='BOX'):
+        if cell_bounds not in self._planes:
+            self._planes[cell_bounds] = original_planes(self.operand, cell_bounds)
+        return self._planes[cell_bounds]
+
+    def octree(self):
+        """OriginalOctree of the operand, to cut cells from a small part of it."""
+        if self._octree is None:
+            bm = bmesh.new()
+            bm.from_mesh(self.operand.data)
+            bm.transform(self.operand.matrix_world)
+            self._octree = OriginalOctree(bm)
+        return self._octree
+
+    def operand_piece(self, box_min, box_max):
+        """Object of the smallest octree piece holding a world space box, for the boolean of a cell.
+
+        The operand itself when the original is small enough to be one piece.
+        """
+        octree = self.octree()
+        node = octree.node(box_min, box_max)
+        if node is octree.root:
+            return self.operand
+        if node["object"] is None:
+            mesh = bpy.data.meshes.new(name=self.operand.name + "_piece")
+            for mat in self.operand.data.materials:
+                mesh.materials.append(mat)
+            node["bm"].to_mesh(mesh)
+            # Not linked to the scene like the baked operand, the piece is in world space.
+            obj = bpy.data.objects.new(name=self.operand.name + "_piece", object_data=mesh)
+            for i, slot_src in enumerate(self.operand.material_slots):
+                if i < len(obj.material_slots):
+                    obj.material_slots[i].link = slot_src.link
+                    obj.material_slots[i].material = slot_src.material
+            node["object"] = obj
+        return node["object"]
+
+    def free(self):
+        if self._octree is not None:
+            self._octree.free()
+            self._octree = None
+        self._bvh = None
+        self._verts = None
+        self._convex.clear()
+        self._planes.clear()
+        if self.is_baked:
+            mesh = self.operand.data
+            bpy.data.objects.remove(self.operand)
+            if not mesh.users:
+                bpy.data.meshes.remove(mesh)
+            self.operand = self.original
+            self.is_baked = False
+
+
+def _points(co, source):
+    """(points_co, points_source) arrays of (n, 3) points all from one source"""
+    co = np.asarray(co, dtype=np.float64).reshape(-1, 3)
+    return co, np.full(len(co), source)
+
+
+def _points_join(points_list):
+    if not points_list:
+        return np.zeros((0, 3)), np.zeros(0, dtype=str)
+    return (np.concatenate([points_co for points_co, _ in points_list]),
+            np.concatenate([points_source for _, points_source in points_list]))
+
+
+def _points_past_closest(points_co, line_co):
+    """A new point for each line point, moved away from its closest point by half the distance.
+
+    The closest point is searched in the points and in the new points made before it.
+    """
+    # The points are searched with a grid made once, the few new points directly.
+    grid = spatial.PointGrid(points_co)
+    new_co = np.empty((len(line_co), 3))
+    for i, co in enumerate(line_co):
+        index, distance = grid.find(co)
+        closest = points_co[index]
+        if i:
+            distances_new = ((new_co[:i] - co) ** 2).sum(axis=1)
+            index_new = int(np.argmin(distances_new))
+            if distances_new[index_new] < distance * distance:
+                closest = new_co[index_new]
+        new_co[i] = co + (co - closest) / 2.0
+    return new_co
+
+
 def points_from_object(original, original_xyz_minmax,
                        source_vert_own=100,
                        source_vert_child=0,
                        source_particle_own=0,
                        source_particle_child=0,
                        source_pencil=0,
-                       source_random=0):
-    
+                       source_random=0,
+                       original_bvh=None):
+    """Seeds of the cells as (points_co, points_source): (n, 3) world space locations and their source tags"""
     points = []
     
-    # This is not used by anywhere
-    def edge_center(mesh, edge):
-        v1, v2 = edge.vertices
-        return (mesh.vertices[v1].co + mesh.vertices[v2].co) / 2.0
-    
-    # This is not used by anywhere
-    def poly_center(mesh, poly):
-        from mathutils import Vector
-        co = Vector()
-        tot = 0
-        for i in poly.loop_indices:
-            co += mesh.vertices[mesh.loops[i].vertex_index].co
-            tot += 1
-        return co / tot
-    
     def points_from_verts(original):
         """Takes points from _any_ object with geometry"""
         if original.type == 'MESH':
             mesh = original.data
-            matrix = original.matrix_world.copy()    
-            p = [(matrix @ v.co, 'VERTS') for v in mesh.vertices]            
-            return p
+            co = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+            mesh.vertices.foreach_get("co", co)
+            return _points(spatial.transform(np.array(original.matrix_world), co), 'VERTS')
         else:
             depsgraph = bpy.context.evaluated_depsgraph_get()
             ob_eval = original.evaluated_get(depsgraph)
@@ -79,44 +445,42 @@ def points_from_object(original, original_xyz_minmax,
                 mesh = None
 
             if mesh is not None:               
-                matrix = original.matrix_world.copy()
-                p =  [(matrix @ v.co, 'VERTS') for v in mesh.vertices]              
+                co = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+                mesh.vertices.foreach_get("co", co)
                 ob_eval.to_mesh_clear()
-                return p
+                return _points(spatial.transform(np.array(original.matrix_world), co), 'VERTS')
+            return _points((), 'VERTS')
 
     def points_from_particles(original):
         depsgraph = bpy.context.evaluated_depsgraph_get()
         obj_eval = original.evaluated_get(depsgraph)
-                     
-        p = [(particle.location.copy(), 'PARTICLE')
-               for psys in obj_eval.particle_systems
-               for particle in psys.particles]
-        return p
+        points_list = []
+        for psys in obj_eval.particle_systems:
+            co = np.empty(len(psys.particles) * 3, dtype=np.float64)
+            psys.particles.foreach_get("location", co)
+            points_list.append(_points(co, 'PARTICLE'))
+        return _points_join(points_list)
     
     def points_from_random(original, original_xyz_minmax):
         xmin, xmax = original_xyz_minmax["x"]
         ymin, ymax = original_xyz_minmax["y"]
         zmin, zmax = original_xyz_minmax["z"]
-
-        from random import uniform
-        from mathutils import Vector
-        
-        p = []
-        for i in range(source_random):
-            new_pos = Vector( (uniform(xmin, xmax), uniform(ymin, ymax), uniform(zmin, zmax)) )
-            p.append((new_pos, 'RANDOM')) 
-        return p  
+        if original_bvh is not None:
+            co = points_in_volume(original_bvh, (xmin, ymin, zmin), (xmax, ymax, zmax), source_random)
+        else:
+            co = sampling.random_points((xmin, ymin, zmin), (xmax, ymax, zmax), source_random)
+        return _points(co, 'RANDOM')
     
      # geom own
     if source_vert_own > 0:
         new_points = points_from_verts(original)
         new_points = _limit_source(new_points, source_vert_own)
-        points.extend(new_points)
+        points.append(new_points)
     
     # random
     if source_random > 0:
         new_points = points_from_random(original, original_xyz_minmax)
-        points.extend(new_points)
+        points.append(new_points)
 
 
     # geom children
@@ -124,23 +488,27 @@ def points_from_object(original, original_xyz_minmax,
         for original_child in original.children:
             new_points  = points_from_verts(original_child)
             new_points = _limit_source(new_points, source_vert_child)
-            points.extend(new_points)
+            points.append(new_points)
     
     # geom particles
     if source_particle_own > 0:
         new_points = points_from_particles(original)
         new_points = _limit_source(new_points, source_particle_own)
-        points.extend(new_points)
+        points.append(new_points)
 
     if source_particle_child > 0:
         for original_child in original.children:
             new_points = points_from_particles(original_child)
             new_points = _limit_source(new_points, source_particle_child)
-            points.extend(new_points)
+            points.append(new_points)
+
+    points_co, points_source = _points_join(points)
 
     # grease pencil
     def get_points(stroke):
-        return [point.co.copy() for point in stroke.points]
+        co = np.empty(len(stroke.points) * 3, dtype=np.float64)
+        stroke.points.foreach_get("co", co)
+        return co.reshape(-1, 3)
 
     def get_splines(gp):
         gpl = gp.layers.active
@@ -159,158 +527,255 @@ def points_from_object(original, original_xyz_minmax,
     if source_pencil > 0:   
         gp = bpy.context.scene.grease_pencil        
         if gp:
-            line_points = []
-            line_points = [(p, 'PENCIL') for spline in get_splines(gp)
-                             for p in spline]
-            if len(line_points) > 0:
+            line_points = _points_join([_points(co, 'PENCIL') for co in get_splines(gp)])
+            if len(line_points[0]) > 0:
                 line_points = _limit_source(line_points, source_pencil)
 
                 # Make New point between the line point and the closest point.
-                if not points:
-                    points.extend(line_points)
+                if not len(points_co):
+                    points_co, points_source = line_points
                     
                 else:
-                    for lp in line_points:
-                        # Make vector between the line point and its closest point.
-                        points.sort(key=lambda p: (p[0] - lp[0]).length_squared)
-                        closest_point = points[0]           
-                        normal = lp[0].xyz - closest_point[0].xyz
-                                   
-                        new_point = (lp[0], lp[1])
-                        new_point[0].xyz +=  normal / 2
-                       
-                        points.append(new_point)
-    #print("Found %d points" % len(points))
-    return points
-
-
-def points_to_cells(context, original, original_xyz_minmax, points,
-                    source_limit=0,
-                    source_noise=0.0,                        
-                    use_smooth_faces=False,
-                    use_data_match=False,
-                    use_debug_points=False,
-                    margin=0.0,
-                    material_index=0,
-                    use_debug_redraw=False,
-                    cell_scale=(1.0, 1.0, 1.0),
-                    clean=True):
+                    points_co = np.concatenate((points_co, _points_past_closest(points_co, line_points[0])))
+                    points_source = np.concatenate((points_source, line_points[1]))
+    #print("Found %d points" % len(points_co))
+    return points_co, points_source
+
 
-    from . import cell_calc
+def _points_co(context, original, original_cache, points,
+               source_limit=0,
+               source_noise=0.0,
+               use_debug_points=False):
+    """Seed locations and sources of the points, limited, rounded and with noise"""
     collection = context.collection
-    view_layer = context.view_layer
-        
+
     # apply optional clamp
-    if source_limit != 0 and source_limit < len(points):
-        points = _limit_source(points, source_limit)
+    points_co, points_source = _limit_source(points, source_limit)
     
     # saddly we cant be sure there are no doubles
-    from mathutils import Vector
-    to_tuple = Vector.to_tuple
-    
     # To remove doubles, round the values.    
-    points = [(Vector(to_tuple(p[0], 4)),p[1]) for p in points]
-    del to_tuple
-    del Vector
+    points_co = np.round(points_co, 4)
 
     if source_noise > 0.0:
-        from random import random
         # boundbox approx of overall scale
-        from mathutils import Vector
-        matrix = original.matrix_world.copy()
-        bb_world = [matrix @ Vector(v) for v in original.bound_box]
-        scalar = source_noise * ((bb_world[0] - bb_world[6]).length / 2.0)
+        bb_world = spatial.transform(np.array(original.matrix_world), [v[:] for v in original.bound_box])
+        scalar = source_noise * (np.sqrt(((bb_world[0] - bb_world[6]) ** 2).sum()) / 2.0)
 
-        from mathutils.noise import random_unit_vector
-        points[:] = [(p[0] + (random_unit_vector() * (scalar * random())), p[1]) for p in points]
+        points_co = points_co + sampling.noise_offsets(len(points_co), scalar)
 
     if use_debug_points:
-        bm = bmesh.new()
-        for p in points:
-            bm.verts.new(p[0])
         mesh_tmp = bpy.data.meshes.new(name="DebugPoints")
-        bm.to_mesh(mesh_tmp)
-        bm.free()
+        mesh_tmp.vertices.add(len(points_co))
+        mesh_tmp.vertices.foreach_set("co", points_co.astype(np.float32).ravel())
         obj_tmp = bpy.data.objects.new(name=mesh_tmp.name, object_data=mesh_tmp)
         collection.objects.link(obj_tmp)
         del obj_tmp, mesh_tmp
     
-    cells_verts = cell_calc.points_to_verts(original_xyz_minmax,
-                                            points,
-                                            cell_scale,
-                                            margin_cell=margin)    
-    # some hacks here :S
-    cell_name = original.name + "_cell"
-    cells = []
-    for center_point, cell_verts in cells_verts:
-        # ---------------------------------------------------------------------
-        # BMESH
-        # create the convex hulls
-        bm = bmesh.new()
-        
-        # WORKAROUND FOR CONVEX HULL BUG/LIMIT
-        # XXX small noise
-        import random
-        def R():
-            return (random.random() - 0.5) * 0.001
-        
-        for i, co in enumerate(cell_verts):
-            co.x += R()
-            co.y += R()
-            co.z += R()
-            bm_vert = bm.verts.new(co)
+    if len(points_co):
+        return points_co, points_source
+    # Without points, the whole bounds make one cell.
+    xyz_min, xyz_max = spatial.minmax(original_cache.verts())
+    return ((xyz_min + xyz_max) / 2.0).reshape(1, 3), None
 
-        import mathutils
-        bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=0.005)
-        try:
-            # Making cell meshes as convex full here!
-            bmesh.ops.convex_hull(bm, input=bm.verts)
-        except RuntimeError:
-            import traceback
-            traceback.print_exc()
 
-        if clean:
-            bm.normal_update()
-            try:
-                bmesh.ops.dissolve_limit(bm, verts=bm.verts, angle_limit=0.001)
-            except RuntimeError:
-                import traceback
-                traceback.print_exc()
-        # smooth faces will remain only inner faces, after appling boolean modifier.
-        if use_smooth_faces:
-            for bm_face in bm.faces:
-                bm_face.smooth = True
+def points_to_cells(context, original, original_cache, points,
+                    source_limit=0,
+                    source_noise=0.0,                        
+                    use_smooth_faces=False,
+                    use_data_match=False,
+                    use_debug_points=False,
+                    margin=0.0,
+                    material_index=0,
+                    use_debug_redraw=False,
+                    cell_scale=(1.0, 1.0, 1.0),
+                    cell_processes=1,
+                    cell_backend='GRID',
+                    cell_bounds='BOX',
+                    cell_output='OBJECTS',
+                    original_convex=None,
+                    use_interior_hide=False,
+                    use_debug_bool=False,
+                    cell_recursion=None):
+    """Cell objects of the points, cut by the boolean later unless original_convex clips them.
+
+    cell_recursion are the keywords of cellset_recurse, to break the cells again before any mesh is made.
+    """
+    points_co, points_source = _points_co(context, original, original_cache, points,
+                                          source_limit=source_limit,
+                                          source_noise=source_noise,
+                                          use_debug_points=use_debug_points)
+    xyz_min, xyz_max = spatial.minmax(original_cache.verts())
+    cellset = voronoi.points_to_cellset(points_co, xyz_min, xyz_max,
+                                        cell_scale,
+                                        margin_cell=margin,
+                                        processes=cell_processes,
+                                        backend=cell_backend,
+                                        planes=original_cache.planes(cell_bounds) if original_convex is None else None,
+                                        sources=points_source,
+                                        clip_planes=original_convex["planes"] if original_convex is not None else None)
+    cells, cells_inside = cellset_to_cells(context, original, original_cache, cellset,
+                                           use_smooth_faces=use_smooth_faces,
+                                           use_data_match=use_data_match,
+                                           margin=margin,
+                                           material_index=material_index,
+                                           use_debug_redraw=use_debug_redraw,
+                                           cell_scale=cell_scale,
+                                           cell_output=cell_output,
+                                           original_convex=original_convex,
+                                           use_interior_hide=use_interior_hide,
+                                           use_debug_bool=use_debug_bool,
+                                           cell_recursion=cell_recursion)
+    context.view_layer.update()
+    return cells, cells_inside
+
+
+def points_to_cells_batch(context, originals, original_caches, points_groups, originals_convex,
+                          source_limit=0,
+                          source_noise=0.0,
+                          use_smooth_faces=False,
+                          use_data_match=False,
+                          use_debug_points=False,
+                          margin=0.0,
+                          material_index=0,
+                          use_debug_redraw=False,
+                          cell_scale=(1.0, 1.0, 1.0),
+                          cell_processes=1,
+                          cell_backend='GRID',
+                          cell_bounds='BOX',
+                          cell_output='OBJECTS',
+                          use_interior_hide=False,
+                          use_debug_bool=False):
+    """points_to_cells for many originals, with the cells of all of them computed in one pass.
+
+    Returns (cells, cells_inside) of each original. The backend is always the grid,
+    a Voronoi diagram of all seeds together would mix the cells of the originals.
+    """
+    groups_co = []
+    groups_sources = []
+    groups_min = []
+    groups_max = []
+    groups_planes = []
+    groups_clip_planes = []
+    for original, original_cache, points, original_convex in zip(
+            originals, original_caches, points_groups, originals_convex):
+        points_co, points_source = _points_co(context, original, original_cache, points,
+                                              source_limit=source_limit,
+                                              source_noise=source_noise,
+                                              use_debug_points=use_debug_points)
+        xyz_min, xyz_max = spatial.minmax(original_cache.verts())
+        groups_co.append(points_co)
+        groups_sources.append(points_source)
+        groups_min.append(xyz_min)
+        groups_max.append(xyz_max)
+        if original_convex is None:
+            groups_planes.append(original_cache.planes(cell_bounds))
+            groups_clip_planes.append(None)
+        else:
+            groups_planes.append(None)
+            groups_clip_planes.append(original_convex["planes"])
+
+    cellsets = voronoi.groups_to_cellsets(groups_co, groups_min, groups_max,
+                                          cell_scale,
+                                          margin_cell=margin,
+                                          processes=cell_processes,
+                                          groups_planes=groups_planes,
+                                          groups_sources=groups_sources,
+                                          groups_clip_planes=groups_clip_planes)
+    cells_groups = []
+    for original, original_cache, cellset, original_convex in zip(
+            originals, original_caches, cellsets, originals_convex):
+        cells_groups.append(cellset_to_cells(context, original, original_cache, cellset,
+                                             use_smooth_faces=use_smooth_faces,
+                                             use_data_match=use_data_match,
+                                             margin=margin,
+                                             material_index=material_index,
+                                             use_debug_redraw=use_debug_redraw,
+                                             cell_scale=cell_scale,
+                                             cell_output=cell_output,
+                                             original_convex=original_convex,
+                                             use_interior_hide=use_interior_hide,
+                                             use_debug_bool=use_debug_bool))
+    context.view_layer.update()
+    return cells_groups
+
+
+def cellset_to_cells(context, original, original_cache, cellset,
+                     use_smooth_faces=False,
+                     use_data_match=False,
+                     margin=0.0,
+                     material_index=0,
+                     use_debug_redraw=False,
+                     cell_scale=(1.0, 1.0, 1.0),
+                     cell_output='OBJECTS',
+                     original_convex=None,
+                     use_interior_hide=False,
+                     use_debug_bool=False,
+                     cell_recursion=None):
+    """Cell objects of a CellSet of the original, as (cells, cells_inside).
+
+    The view layer isn't updated, so it can be done once for many originals.
+    With use_debug_bool every cell is kept for the boolean, none are dropped as inside or outside.
+    """
+    collection = context.collection
+    view_layer = context.view_layer
 
-        if material_index != 0:
-            for bm_face in bm.faces:
-                bm_face.material_index = material_index
+    if original_convex is None and not use_debug_bool:
+        # Only cells that cross the surface of the original need the boolean,
+        # cells outside of it are dropped before making any mesh.
+        cells_inside_mask, cells_outside_mask = cells_classify(original_cache.bvh(), cellset)
+        cellset = cellset.take(np.flatnonzero(~cells_outside_mask))
+        cells_inside_mask = cells_inside_mask[~cells_outside_mask]
+        if cell_recursion is not None:
+            cellset = cellset_recurse(cellset, cell_scale=cell_scale, margin=margin, **cell_recursion)
+            cells_inside_mask, cells_outside_mask = cells_classify(original_cache.bvh(), cellset)
+            cellset = cellset.take(np.flatnonzero(~cells_outside_mask))
+            cells_inside_mask = cells_inside_mask[~cells_outside_mask]
+    else:
+        if cell_recursion is not None:
+            cellset = cellset_recurse(cellset, cell_scale=cell_scale, margin=margin, **cell_recursion)
+        # Already clipped by the original, they are final,
+        # or all shown with their boolean for debugging.
+        cells_inside_mask = np.zeros(len(cellset), dtype=bool)
+    face_attrs, loop_uvs = _cells_face_attrs(cellset, original_convex,
+                                             material_index=material_index,
+                                             use_smooth_faces=use_smooth_faces,
+                                             use_interior_hide=use_interior_hide)
+    # some hacks here :S
+    cell_name = original.name + "_cell"
+    # Cells copy their materials and data layers from this, instead of making them each time.
+    mesh_template = _cell_mesh_template(original, cell_name, use_data_match=use_data_match)
+    if cell_output == 'PACKED' and original_convex is not None:
+        # Cells needing the boolean are made one by one, and packed by cells_pack() after it.
+        cell = _cells_packed(original, cellset, mesh_template, cell_name, face_attrs, loop_uvs,
+                             use_data_match=use_data_match)
+        collection.objects.link(cell)
+        return [cell], []
 
+    cells = []
+    cells_inside = []
+    for cell_index in range(len(cellset)):
+        center_point = cellset.centers[cell_index].tolist()
         # ---------------------------------------------------------------------
         # MESH
-        mesh_dst = bpy.data.meshes.new(name=cell_name)
-
-        bm.to_mesh(mesh_dst)
-        bm.free()
-        del bm
-
-        if use_data_match:
-            # match materials and data layers so boolean displays them
-            # currently only materials + data layers, could do others...
-            mesh_src = original.data
-            for mat in mesh_src.materials:
-                mesh_dst.materials.append(mat)
-            for lay_attr in ("vertex_colors", "uv_layers"):
-                lay_src = getattr(mesh_src, lay_attr)
-                lay_dst = getattr(mesh_dst, lay_attr)
-                for key in lay_src.keys():
-                    lay_dst.new(name=key)
+        # The cell is already convex with one polygon per plane, no hull needed.
+        mesh_dst = mesh_template.copy()
+        loops, loop_starts, loop_totals = cellset.cell_loops(cell_index)
+        _mesh_from_arrays(mesh_dst, cellset.cell_verts(cell_index), loops, loop_starts, loop_totals)
+        face_start, face_end = cellset.cell_face_offsets[cell_index:cell_index + 2]
+        loop_start, loop_end = cellset.face_offsets[face_start], cellset.face_offsets[face_end]
+        _mesh_face_attrs(mesh_dst,
+                         {attr: values[face_start:face_end] for attr, values in face_attrs.items()},
+                         {name: uv[loop_start:loop_end] for name, uv in loop_uvs.items()})
 
         # ---------------------------------------------------------------------
         # OBJECT
         cell = bpy.data.objects.new(name=cell_name, object_data=mesh_dst)
         collection.objects.link(cell)
         cell.location = center_point
-        cells.append(cell)
+        if cells_inside_mask[cell_index]:
+            cells_inside.append(cell)
+        else:
+            cells.append(cell)
 
         # support for object materials
         if use_data_match:
@@ -325,7 +790,8 @@ def points_to_cells(context, original, original_xyz_minmax, points,
             view_layer.update()
             _redraw_yasiamevil()
 
-    view_layer.update()
+    bpy.data.meshes.remove(mesh_template)
+
     # move this elsewhere...
     # Blender 2.8: BGE integration was disabled, --
     # -- because BGE was deleted in Blender 2.8. 
@@ -336,133 +802,718 @@ def points_to_cells(context, original, original_xyz_minmax, points,
         game.use_collision_bounds = True
         game.collision_bounds_type = 'CONVEX_HULL'
     '''
+    return cells, cells_inside
+
+
+def _cellset_faces_total(cellset):
+    return int(cellset.cell_face_offsets[-1])
+
+
+def cellset_recurse(cellset, recursion, source_limit,
+                    clamp=0,
+                    chance=1.0,
+                    chance_select='SIZE_MIN',
+                    cursor=(0.0, 0.0, 0.0),
+                    cell_scale=(1.0, 1.0, 1.0),
+                    margin=0.0,
+                    budget=None):
+    """Break the cells again in geometry, recursion times, choosing them like main_object does the cell objects.
+
+    budget is the RecursionBudget of the time, faces and memory limits, checked between batches of cells.
+    """
+    if budget is not None:
+        budget.add(len(cellset), _cellset_faces_total(cellset))
+    for level_sub in range(1, recursion + 1):
+        cells_total = len(cellset)
+        if clamp and cells_total >= clamp:
+            break
+        if chance_select == 'RANDOM':
+            order = np.random.permutation(cells_total)
+        elif chance_select in {'SIZE_MIN', 'SIZE_MAX'}:
+            order = np.argsort(cellset.radii(), kind="stable")
+            if chance_select == 'SIZE_MAX':
+                order = order[::-1]
+        else:
+            distances = ((cellset.centers - np.asarray(cursor, dtype=np.float64)) ** 2).sum(axis=1)
+            order = np.argsort(distances, kind="stable")
+            if chance_select == 'CURSOR_MAX':
+                order = order[::-1]
+        if chance != 1.0:
+            order = order[:int(chance * cells_total)]
+        if clamp:
+            # Each broken cell adds up to source_limit - 1 cells.
+            order = order[:-(-(clamp - cells_total) // max(source_limit - 1, 1))]
+
+        cells_queue = order.tolist()
+        cells_broken = []
+        cellsets_sub = []
+        while cells_queue:
+            cells_batch = cells_queue[:] if budget is None else budget.batch(cells_queue, source_limit)
+            if not cells_batch:
+                break
+            del cells_queue[:len(cells_batch)]
+            cellset_batch = cellset.take(cells_batch)
+            cellset_sub = voronoi.subdivide_cells(cellset_batch, np.arange(len(cells_batch)), source_limit,
+                                                  points_scale=cell_scale,
+                                                  margin_cell=margin)
+            if budget is not None:
+                budget.batch_done(len(cellset_batch), len(cellset_sub),
+                                  _cellset_faces_total(cellset_batch), _cellset_faces_total(cellset_sub))
+            cells_broken += cells_batch
+            cellsets_sub.append(cellset_sub)
+        cells_keep = np.ones(cells_total, dtype=bool)
+        cells_keep[cells_broken] = False
+        cellset = CellSet.concatenate([cellset.take(np.flatnonzero(cells_keep))] + cellsets_sub)
+
+        if budget is not None and budget.reason is not None:
+            print("Cell Fracture: recursion stopped at level %d, %s limit reached" %
+                  (level_sub, budget.reason))
+            break
+    return cellset
+
+
+def _cell_mesh_template(original, name, use_data_match=False):
+    """Empty mesh with the materials and data layers for the cells"""
+    mesh = bpy.data.meshes.new(name=name)
+    if use_data_match:
+        # match materials and data layers so boolean displays them
+        # currently only materials + data layers, could do others...
+        mesh_src = original.data
+        for mat in mesh_src.materials:
+            mesh.materials.append(mat)
+        for lay_attr in ("vertex_colors", "uv_layers"):
+            lay_src = getattr(mesh_src, lay_attr)
+            lay_dst = getattr(mesh, lay_attr)
+            for key in lay_src.keys():
+                lay_dst.new(name=key)
+    return mesh
+
+
+def _mesh_from_arrays(mesh, verts, loops, loop_starts, loop_totals):
+    """Fill an empty mesh from flat arrays, one foreach_set per attribute"""
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(verts, dtype=np.float32).ravel())
+    mesh.loops.add(len(loops))
+    mesh.loops.foreach_set("vertex_index", np.ascontiguousarray(loops, dtype=np.int32))
+    mesh.polygons.add(len(loop_starts))
+    mesh.polygons.foreach_set("loop_start", np.ascontiguousarray(loop_starts, dtype=np.int32))
+    mesh.polygons.foreach_set("loop_total", np.ascontiguousarray(loop_totals, dtype=np.int32))
+    mesh.update(calc_edges=True)
+
+
+def _mesh_face_attrs(mesh, face_attrs, loop_uvs):
+    for attr, values in face_attrs.items():
+        mesh.polygons.foreach_set(attr, np.ascontiguousarray(values))
+    for name, uv in loop_uvs.items():
+        mesh.uv_layers[name].data.foreach_set("uv", np.ascontiguousarray(uv, dtype=np.float32).ravel())
+
+
+def _cells_face_attrs(cellset, original_convex=None,
+                      material_index=0,
+                      use_smooth_faces=False,
+                      use_interior_hide=False):
+    """Face values of all cells, and UVs of all loops for each UV layer, to set on their meshes.
+
+    Faces on the planes of a convex original take the values of its faces there.
+    """
+    faces_total = len(cellset.face_planes)
+    # smooth faces will remain only inner faces, after appling boolean modifier.
+    face_attrs = {
+        "use_smooth": np.full(faces_total, use_smooth_faces, dtype=bool),
+        "material_index": np.full(faces_total, material_index, dtype=np.int32),
+        }
+    loop_uvs = {}
+    if original_convex is None:
+        return face_attrs, loop_uvs
+
+    face_planes = cellset.face_planes
+    exterior = face_planes >= 0
+    plane = np.maximum(face_planes, 0)
+    face_attrs["use_smooth"] = np.where(exterior, original_convex["use_smooth"][plane], use_smooth_faces)
+    face_attrs["material_index"] = np.where(exterior, original_convex["material_index"][plane],
+                                            material_index).astype(np.int32)
+    if use_interior_hide:
+        # Like the boolean, hidden faces are the interior ones.
+        face_attrs["hide"] = np.where(exterior, original_convex["hide"][plane], True)
+
+    if original_convex["uv_layers"]:
+        loop_totals = np.diff(cellset.face_offsets)
+        face_cells = np.repeat(np.arange(len(cellset)), np.diff(cellset.cell_face_offsets))
+        loop_cells = np.repeat(face_cells, loop_totals)
+        loop_co = cellset.verts[cellset.vert_offsets[loop_cells] + cellset.loops] + cellset.centers[loop_cells]
+        loop_co = np.hstack((loop_co, np.ones((len(loop_co), 1))))
+        loop_planes = np.repeat(plane, loop_totals)
+        loop_exterior = np.repeat(exterior, loop_totals)
+        for name, affine in original_convex["uv_layers"].items():
+            uv = np.einsum("li,lij->lj", loop_co, affine[loop_planes])
+            uv[~loop_exterior] = 0.0
+            loop_uvs[name] = uv
+    return face_attrs, loop_uvs
+
+
+def _cells_packed(original, cellset, mesh, name, face_attrs, loop_uvs,
+                  use_data_match=False):
+    """All cells in one object, with the cell of each face and vertex in "cell_id" layers"""
+    verts, loops, loop_starts, loop_totals, face_cells, vert_cells = cellset.packed()
+    _mesh_from_arrays(mesh, verts, loops, loop_starts, loop_totals)
+    _mesh_face_attrs(mesh, face_attrs, loop_uvs)
+    mesh.polygon_layers_int.new(name="cell_id").data.foreach_set("value", face_cells)
+    mesh.vertex_layers_int.new(name="cell_id").data.foreach_set("value", vert_cells)
+
+    cell = bpy.data.objects.new(name=name, object_data=mesh)
+    # Cells are placed from these when exploded.
+    cell["cell_centers"] = cellset.centers.ravel().tolist()
+
+    if use_data_match:
+        for i in range(len(mesh.materials)):
+            slot_src = original.material_slots[i]
+            slot_dst = cell.material_slots[i]
+
+            slot_dst.link = slot_src.link
+            slot_dst.material = slot_src.material
+    return cell
+
+
+def _mesh_arrays(mesh):
+    """Vertices, loops, face values and loop layers of a mesh as arrays, to copy parts of it"""
+    faces_total = len(mesh.polygons)
+    loops_total = len(mesh.loops)
+    arrays = {}
+    arrays["verts"] = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", arrays["verts"])
+    arrays["verts"] = arrays["verts"].reshape(-1, 3)
+    arrays["loops"] = np.empty(loops_total, dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", arrays["loops"])
+    for attr, dtype in (("loop_start", np.int32), ("loop_total", np.int32),
+                        ("material_index", np.int32), ("use_smooth", bool), ("hide", bool)):
+        arrays[attr] = np.empty(faces_total, dtype=dtype)
+        mesh.polygons.foreach_get(attr, arrays[attr])
+    arrays["loop_layers"] = []
+    for lay_attr, value_attr, size in (("uv_layers", "uv", 2), ("vertex_colors", "color", 4)):
+        for lay_src in getattr(mesh, lay_attr):
+            data = np.empty(loops_total * size, dtype=np.float32)
+            lay_src.data.foreach_get(value_attr, data)
+            arrays["loop_layers"].append((lay_attr, lay_src.name, value_attr, data.reshape(-1, size)))
+    return arrays
+
+
+def cells_pack(context, cells):
+    """Join cells into one packed cell object, with the cell of each face and vertex in "cell_id" layers.
+
+    The cells are removed. Run after the boolean, so each cell is cut on its own and
+    the boolean never sees the cells touching each other.
+    """
+    if not cells:
+        return None
+    verts = []
+    loops = []
+    loop_totals = []
+    face_values = {attr: [] for attr in ("material_index", "use_smooth", "hide")}
+    loop_layers = {}
+    face_cells = []
+    vert_cells = []
+    centers = []
+    verts_total = 0
+    loops_total = 0
+    for cell_index, cell in enumerate(cells):
+        arrays = _mesh_arrays(cell.data)
+        matrix = np.array(cell.matrix_world, dtype=np.float64)
+        verts.append(spatial.transform(matrix, arrays["verts"]))
+        loops.append(arrays["loops"] + verts_total)
+        loop_totals.append(arrays["loop_total"])
+        for attr, values in face_values.items():
+            values.append(arrays[attr])
+        for lay_attr, name, value_attr, data in arrays["loop_layers"]:
+            loop_layers.setdefault((lay_attr, name, value_attr), []).append((loops_total, data))
+        face_cells.append(np.full(len(arrays["loop_total"]), cell_index, dtype=np.int32))
+        vert_cells.append(np.full(len(arrays["verts"]), cell_index, dtype=np.int32))
+        centers.append(matrix[:3, 3])
+        verts_total += len(arrays["verts"])
+        loops_total += len(arrays["loops"])
+
+    cell_first = cells[0]
+    mesh = bpy.data.meshes.new(name=cell_first.data.name)
+    for mat in cell_first.data.materials:
+        mesh.materials.append(mat)
+    loop_totals = np.concatenate(loop_totals)
+    loop_starts = np.concatenate(([0], np.cumsum(loop_totals)[:-1]))
+    _mesh_from_arrays(mesh, np.concatenate(verts), np.concatenate(loops), loop_starts, loop_totals)
+    for attr, values in face_values.items():
+        mesh.polygons.foreach_set(attr, np.concatenate(values))
+    for (lay_attr, name, value_attr), parts in loop_layers.items():
+        # A layer missing from some cells is left at zero for their loops.
+        data = np.zeros((loops_total, parts[0][1].shape[1]), dtype=np.float32)
+        for loop_start, part in parts:
+            data[loop_start:loop_start + len(part)] = part
+        getattr(mesh, lay_attr).new(name=name).data.foreach_set(value_attr, data.ravel())
+    mesh.polygon_layers_int.new(name="cell_id").data.foreach_set("value", np.concatenate(face_cells))
+    mesh.vertex_layers_int.new(name="cell_id").data.foreach_set("value", np.concatenate(vert_cells))
+
+    from mathutils import Matrix
+    cell = _object_part(cell_first, mesh, Matrix.Identity(4))
+    cell["cell_centers"] = np.concatenate(centers).tolist()
+
+    for cell_src in cells:
+        mesh_src = cell_src.data
+        bpy.data.objects.remove(cell_src, do_unlink=True)
+        if not mesh_src.users:
+            bpy.data.meshes.remove(mesh_src)
+    context.view_layer.update()
+    return cell
+
+
+def _mesh_part(mesh_src, arrays, faces, name, offset=None):
+    """New mesh of some faces of a mesh, from its _mesh_arrays, moved by -offset.
+
+    Materials, smooth and hidden faces, UVs and vertex colors are kept, vertex groups are not.
+    """
+    loop_starts = arrays["loop_start"][faces]
+    loop_totals = arrays["loop_total"][faces]
+    # Loop indices of the faces, each face is a contiguous range.
+    loop_offsets = np.concatenate(([0], np.cumsum(loop_totals)[:-1]))
+    loop_index = np.repeat(loop_starts - loop_offsets, loop_totals) + np.arange(loop_totals.sum())
+    vert_index, loops = np.unique(arrays["loops"][loop_index], return_inverse=True)
+    verts = arrays["verts"][vert_index]
+    if offset is not None:
+        verts = verts - offset
+
+    mesh_dst = bpy.data.meshes.new(name=name)
+    for mat in mesh_src.materials:
+        mesh_dst.materials.append(mat)
+    _mesh_from_arrays(mesh_dst, verts, loops, loop_offsets, loop_totals)
+    for attr in ("material_index", "use_smooth", "hide"):
+        mesh_dst.polygons.foreach_set(attr, arrays[attr][faces])
+    for lay_attr, name, value_attr, data in arrays["loop_layers"]:
+        lay_dst = getattr(mesh_dst, lay_attr).new(name=name)
+        lay_dst.data.foreach_set(value_attr, data[loop_index].ravel())
+    return mesh_dst
+
+
+def _object_part(obj_src, mesh_dst, matrix):
+    """Object for a part of another one, in the same collections and with the same material slots"""
+    obj_dst = bpy.data.objects.new(name=obj_src.name, object_data=mesh_dst)
+    for colle in obj_src.users_collection:
+        colle.objects.link(obj_dst)
+    obj_dst.matrix_world = matrix
+    for i in range(min(len(obj_dst.material_slots), len(obj_src.material_slots))):
+        obj_dst.material_slots[i].link = obj_src.material_slots[i].link
+        obj_dst.material_slots[i].material = obj_src.material_slots[i].material
+    return obj_dst
+
+
+def _mesh_remove_faces(mesh, faces):
+    """Remove faces by index, with their vertices and edges no other face uses"""
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bm.faces.ensure_lookup_table()
+    bmesh.ops.delete(bm, geom=[bm.faces[i] for i in faces.tolist()], context='FACES')
+    bm.to_mesh(mesh)
+    bm.free()
+
+
+def packed_explode(context, cell, cell_ids=None):
+    """Move cells out of a packed cell object into their own objects, all when cell_ids is None."""
+    from mathutils import Matrix
+
+    mesh_src = cell.data
+    layer = mesh_src.polygon_layers_int.get("cell_id")
+    if layer is None:
+        return []
+
+    face_cells = np.empty(len(mesh_src.polygons), dtype=np.int32)
+    layer.data.foreach_get("value", face_cells)
+    if cell_ids is None:
+        cell_ids = np.unique(face_cells)
+    cell_ids = set(int(i) for i in cell_ids) & set(face_cells.tolist())
+    if not cell_ids:
+        return []
+
+    arrays = _mesh_arrays(mesh_src)
+    centers = np.array(cell["cell_centers"], dtype=np.float64).reshape(-1, 3)
+    cells = []
+    for cell_id in sorted(cell_ids):
+        faces = np.flatnonzero(face_cells == cell_id)
+        if cell_id < len(centers):
+            center = centers[cell_id]
+        else:
+            center = arrays["verts"][arrays["loops"][arrays["loop_start"][faces]]].mean(axis=0)
+        mesh_dst = _mesh_part(mesh_src, arrays, faces, cell.name, offset=center)
+        cells.append(_object_part(cell, mesh_dst, cell.matrix_world @ Matrix.Translation(center.tolist())))
+
+    # Take the exploded cells out of the packed object.
+    _mesh_remove_faces(mesh_src, np.flatnonzero(np.isin(face_cells, sorted(cell_ids))))
+
+    context.view_layer.update()
     return cells
 
 
-def cell_boolean(context, original, cells,
-                use_debug_bool=False,
-                clean=True,
-                use_island_split=False,
-                use_interior_hide=False,
-                use_debug_redraw=False,
-                level=0,
-                remove_doubles=True
-                ):
+def _bmesh_clean(bm, clean=True, remove_doubles=True):
+    """Cleanup of a cut cell in one pass, before it goes back to the mesh, for both engines"""
+    if clean and bm.verts:
+        bm.normal_update()
+        try:
+            bmesh.ops.dissolve_limit(bm, verts=bm.verts, edges=bm.edges, angle_limit=0.001)
+        except RuntimeError:
+            import traceback
+            traceback.print_exc()
+    if remove_doubles and bm.verts:
+        bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=0.005)
 
-    cells_boolean = []
-    collection = context.collection
-    scene = context.scene
-    view_layer = context.view_layer
-        
-    if use_interior_hide and level == 0:
-        # only set for level 0
-        original.data.polygons.foreach_set("hide", [False] * len(original.data.polygons))  
-    
-    # The first object can't be applied by bool, so it is used as a no-effect first straw-man.
-    bpy.ops.mesh.primitive_cube_add(enter_editmode=False, location=(original.location.x+10000000000.0, 0, 0))
-    temp_cell = bpy.context.active_object
-    cells.insert(0, temp_cell)
-    
-    bpy.ops.object.select_all(action='DESELECT')  
-    for i, cell in enumerate(cells):
+
+def cells_boolean_apply(context, operand, cells, clean=True, remove_doubles=True):
+    """Intersect cells with the operand, writing the result into the cell meshes.
+
+    operand may also be a list of one operand per cell.
+    Cells that are left empty keep an empty mesh. Also run by the background workers.
+    """
+    operands = operand if isinstance(operand, list) else [operand] * len(cells)
+    for cell, operand in zip(cells, operands):
         mod = cell.modifiers.new(name="Boolean", type='BOOLEAN')
-        mod.object = original
+        mod.object = operand
         mod.operation = 'INTERSECT'
 
-        if not use_debug_bool:
+    # Evaluate all cells at once, rather than applying each modifier with an operator.
+    context.view_layer.update()
+    depsgraph = context.evaluated_depsgraph_get()
+
+    for cell in cells:
+        bm = bmesh.new()
+        bm.from_object(cell, depsgraph)
+        cell.modifiers.remove(cell.modifiers["Boolean"])
+
+        _bmesh_clean(bm, clean=clean, remove_doubles=remove_doubles)
+        bm.to_mesh(cell.data)
+        bm.free()
+
+
+def cells_boolean_workers(context, operand, cells, workers, clean=True, remove_doubles=True):
+    """Run cells_boolean_apply in background Blender processes, each on a share of the cells.
+
+    The operands and cells go to the workers in a temporary .blend file, the
+    result meshes come back the same way and replace the cell meshes in order.
+    Shares of failed workers are done here instead.
+    """
+    operands = operand if isinstance(operand, list) else [operand] * len(cells)
+    import os
+    import shutil
+    import subprocess
+    import tempfile
+
+    dirpath = tempfile.mkdtemp(prefix="cell_fracture_")
+    try:
+        filepath_in = os.path.join(dirpath, "cells.blend")
+        bpy.data.libraries.write(filepath_in, {*operands, *cells})
+
+        addon_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cell_boolean_worker.py")
+        chunk_size = -(-len(cells) // workers)
+        chunks = [range(i, min(i + chunk_size, len(cells))) for i in range(0, len(cells), chunk_size)]
+        procs = []
+        for i, chunk in enumerate(chunks):
+            filepath_out = os.path.join(dirpath, "result_%d.blend" % i)
+            args = [bpy.app.binary_path, "--background", "--factory-startup",
+                    "--python", script, "--",
+                    os.path.dirname(addon_path), os.path.basename(addon_path),
+                    filepath_in, filepath_out,
+                    str(int(clean)), str(int(remove_doubles))]
+            for cell_index in chunk:
+                args += [operands[cell_index].name, cells[cell_index].name]
+            procs.append((subprocess.Popen(args, stdout=subprocess.DEVNULL), filepath_out))
+
+        for chunk, (proc, filepath_out) in zip(chunks, procs):
+            chunk_operands = [operands[cell_index] for cell_index in chunk]
+            chunk = [cells[cell_index] for cell_index in chunk]
+            if proc.wait() != 0 or not os.path.exists(filepath_out):
+                print("Cell Fracture: boolean worker failed, running its cells here")
+                cells_boolean_apply(context, chunk_operands, chunk, clean=clean, remove_doubles=remove_doubles)
+                continue
+            with bpy.data.libraries.load(filepath_out) as (data_from, data_to):
+                data_to.meshes = data_from.meshes
+            # Loaded names may change, the workers number the meshes by cell.
+            meshes = sorted(data_to.meshes, key=lambda mesh: mesh["cell_index"])
+            for cell, mesh in zip(chunk, meshes):
+                del mesh["cell_index"]
+                mesh_old = cell.data
+                for slot_index, mat in enumerate(mesh_old.materials):
+                    mesh.materials[slot_index] = mat
+                cell.data = mesh
+                if not mesh_old.users:
+                    bpy.data.meshes.remove(mesh_old)
+    finally:
+        shutil.rmtree(dirpath, ignore_errors=True)
+
+
+def cell_boolean(context, original_cache, cells, cells_inside=(), **kw):
+    """Cut the cells from the original, see cell_boolean_batch."""
+    return cell_boolean_batch(context, [original_cache], [cells], [cells_inside], **kw)[0]
+
+
+def cell_boolean_batch(context, original_caches, cells_groups, cells_inside_groups,
+                       use_debug_bool=False,
+                       clean=True,
+                       use_island_split=False,
+                       use_interior_hide=False,
+                       use_debug_redraw=False,
+                       level=0,
+                       remove_doubles=True,
+                       boolean_workers=0,
+                       ):
+    """Cut the cells of each original from it, all with one evaluation. Returns the cells of each original."""
+    groups_boolean = []
+    operands = []
+    cells_all = []
+    for original_cache, cells, cells_inside in zip(original_caches, cells_groups, cells_inside_groups):
+        cells_boolean = []
+        # Baked once for all cells, the original itself when it has no modifiers.
+        operand = original_cache.operand
+
+        if use_interior_hide and level == 0:
+            # only set for level 0
+            operand.data.polygons.foreach_set("hide", [False] * len(operand.data.polygons))
+
+        if use_debug_bool:
+            for cell in cells:
+                mod = cell.modifiers.new(name="Boolean", type='BOOLEAN')
+                mod.object = operand
+                mod.operation = 'INTERSECT'
+        elif use_interior_hide:
+            for cell in cells:
+                cell.data.polygons.foreach_set("hide", [True] * len(cell.data.polygons))
+
+        # Cells inside the original are kept as they are, all their faces are interior.
+        for cell in cells_inside:
             if use_interior_hide:
                 cell.data.polygons.foreach_set("hide", [True] * len(cell.data.polygons))
-            
-            # mesh_old should be made before appling boolean modifier.
-            mesh_old = cell.data
-                       
-            original.select_set(True)
-            cell.select_set(True)
-            bpy.context.view_layer.objects.active = cell
-            bpy.ops.object.modifier_apply(apply_as='DATA', modifier="Boolean")
-            
-            if i == 0:
+            cells_boolean.append(cell)
+
+        groups_boolean.append(cells_boolean)
+        # Each cell is cut from the smallest part of the original around it,
+        # so its boolean doesn't grow with the faces of the whole original.
+        if not use_debug_bool:
+            operands += [original_cache.operand_piece(*_object_minmax(cell)) for cell in cells]
+        cells_all += cells
+
+    if use_debug_bool:
+        return [cells_boolean + cells for cells_boolean, cells in zip(groups_boolean, cells_groups)]
+
+    # Starting Blender takes a while, only worth it for many cells.
+    if boolean_workers > 1 and len(cells_all) >= 4 * boolean_workers:
+        cells_boolean_workers(context, operands, cells_all, boolean_workers, clean=clean, remove_doubles=remove_doubles)
+    else:
+        cells_boolean_apply(context, operands, cells_all, clean=clean, remove_doubles=remove_doubles)
+
+    for cells_boolean, cells in zip(groups_boolean, cells_groups):
+        for cell in cells:
+            mesh = cell.data
+            if not mesh.vertices:
+                # Nothing of the original is inside this cell.
                 bpy.data.objects.remove(cell, do_unlink=True)
+                if not mesh.users:
+                    bpy.data.meshes.remove(mesh)
                 continue
-                        
-            cell = bpy.context.active_object
-            cell.select_set(False)
-            
-            # depsgraph sould be gotten after applied boolean modifier, for new_mesh.
-            depsgraph = context.evaluated_depsgraph_get()
-            cell_eval = cell.evaluated_get(depsgraph)
-            
-            mesh_new = bpy.data.meshes.new_from_object(cell_eval)            
-            cell.data = mesh_new
-            
-            '''
-            check_hide = [11] * len(cell.data.polygons)
-            cell.data.polygons.foreach_get("hide", check_hide)
-            print(check_hide) 
-            '''
-            
-            # remove if not valid
-            if not mesh_old.users:
-                bpy.data.meshes.remove(mesh_old)
-            if not mesh_new.vertices:
-                collection.objects.unlink(cell)
-                if not cell.users:
-                    bpy.data.objects.remove(cell)
-                    cell = None
-                    if not mesh_new.users:
-                        bpy.data.meshes.remove(mesh_new)
-                        mesh_new = None
-
-            # avoid unneeded bmesh re-conversion
-            if mesh_new is not None:
-                bm = None
-
-                if clean:
-                    if bm is None:  # ok this will always be true for now...
-                        bm = bmesh.new()
-                        bm.from_mesh(mesh_new)
-                    bm.normal_update()
-                    try:
-                        bmesh.ops.dissolve_limit(bm, verts=bm.verts, edges=bm.edges, angle_limit=0.001)
-                    except RuntimeError:
-                        import traceback
-                        traceback.print_exc()
-
-                if remove_doubles:
-                    if bm is None:
-                        bm = bmesh.new()
-                        bm.from_mesh(mesh_new)
-                    bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=0.005)
-
-                if bm is not None:
-                    bm.to_mesh(mesh_new)
-                    bm.free()
-
-            del mesh_new
-            del mesh_old
-
-        if cell is not None:
             cells_boolean.append(cell)
 
             if use_debug_redraw:
                 _redraw_yasiamevil()
-    
-    bpy.context.view_layer.objects.active = original
-    
-    if (not use_debug_bool) and use_island_split:
-        # this is ugly and Im not proud of this - campbell
-        for ob in view_layer.objects:
-            ob.select_set(False)
-        for cell in cells_boolean:
-            cell.select_set(True)        
-        # If new separated meshes are made, selected objects is increased.
-        if cells_boolean:
-            bpy.ops.mesh.separate(type='LOOSE')
-
-        cells_boolean[:] = [cell for cell in scene.objects if cell.select_get()]
-     
-    context.view_layer.update()    
-    return cells_boolean
+
+    bpy.context.view_layer.objects.active = original_caches[0].original
+
+    if use_island_split:
+        groups_boolean = [cells_island_split(context, cells_boolean) for cells_boolean in groups_boolean]
+
+    context.view_layer.update()
+    return groups_boolean
+
+
+def _object_minmax(obj):
+    """World space bounds of the vertices of a mesh object, as two arrays"""
+    co = np.empty(len(obj.data.vertices) * 3, dtype=np.float64)
+    obj.data.vertices.foreach_get("co", co)
+    return spatial.minmax(spatial.transform(np.array(obj.matrix_world), co))
+
+
+def _bmesh_bisect_fill(bm, plane_co, plane_no, material_index=None, smooth=None, hide=False):
+    """Cut away the outer side of a plane, and fill the cut like a hole."""
+    ret = bmesh.ops.bisect_plane(bm, geom=bm.verts[:] + bm.edges[:] + bm.faces[:],
+                                 dist=0.0001, plane_co=plane_co, plane_no=plane_no,
+                                 clear_outer=True)
+    cut_edges = [ele for ele in ret["geom_cut"] if isinstance(ele, bmesh.types.BMEdge)]
+    if not bm.faces or not cut_edges:
+        return
+    for bm_face in bmesh.ops.holes_fill(bm, edges=cut_edges, sides=0)["faces"]:
+        if material_index is not None:
+            bm_face.material_index = material_index
+        if smooth is not None:
+            bm_face.smooth = smooth
+        bm_face.hide = hide
+
+
+class OriginalOctree:
+    """The original cut into a loose octree of closed pieces, made when first needed.
+
+    A piece is the original clipped by the box of its node (and its parents),
+    with the cuts filled, so cutting a cell out of the smallest piece around it
+    gives the same as cutting it out of the whole original.
+    """
+
+    # Pieces with fewer faces are cheap enough to cut cells from, they aren't split.
+    FACES_MAX = 1000
+    DEPTH_MAX = 8
+    # Child boxes grow by this part of their size, so less cells straddle two children.
+    LOOSE = 0.25
+
+    def __init__(self, bm):
+        """Takes ownership of a closed world space bmesh."""
+        co_min, co_max = spatial.minmax([bm_vert.co[:] for bm_vert in bm.verts])
+        self.root = {"min": co_min, "max": co_max, "bm": bm, "object": None, "children": {}}
+
+    def piece(self, box_min, box_max):
+        """Smallest piece holding a box, don't change it: copy it."""
+        return self.node(box_min, box_max)["bm"]
+
+    def node(self, box_min, box_max):
+        """Smallest node holding a box, its "object" is made by OriginalCache.operand_piece."""
+        box_min = np.asarray(box_min, dtype=np.float64)
+        box_max = np.asarray(box_max, dtype=np.float64)
+        node = self.root
+        for _ in range(self.DEPTH_MAX):
+            if len(node["bm"].faces) <= self.FACES_MAX:
+                break
+            child = self._child(node, box_min, box_max)
+            if child is None:
+                break
+            node = child
+        return node
+
+    def _child(self, node, box_min, box_max):
+        node_min, node_max = node["min"], node["max"]
+        center = (node_min + node_max) / 2.0
+        octant = tuple(((box_min + box_max) / 2.0 > center).tolist())
+        child = node["children"].get(octant)
+        if child is None:
+            child_min = np.where(octant, center, node_min)
+            child_max = np.where(octant, node_max, center)
+            grow = (child_max - child_min) * self.LOOSE
+            child = {"min": child_min - grow, "max": child_max + grow, "bm": None, "object": None,
+                     "children": {}}
+            node["children"][octant] = child
+        # The caps of a piece are on its box, keep them clear of the cells.
+        epsilon = 1e-4 * max((node_max - node_min).max(), 1e-6)
+        if (box_min - epsilon < child["min"]).any() or (box_max + epsilon > child["max"]).any():
+            return None
+        if child["bm"] is None:
+            bm = node["bm"].copy()
+            for plane in voronoi.bounds_planes(child["min"], child["max"]).tolist():
+                _bmesh_bisect_fill(bm, -plane[3] * np.array(plane[:3]), plane[:3])
+                if not bm.faces:
+                    break
+            child["bm"] = bm
+        return child
+
+    def free(self):
+        nodes = [self.root]
+        while nodes:
+            node = nodes.pop()
+            if node["bm"] is not None:
+                node["bm"].free()
+            if node["object"] is not None:
+                mesh = node["object"].data
+                bpy.data.objects.remove(node["object"])
+                bpy.data.meshes.remove(mesh)
+            nodes.extend(node["children"].values())
+
+
+def cell_bisect(context, original_cache, cells,
+                cells_inside=(),
+                use_island_split=False,
+                use_interior_hide=False,
+                use_debug_redraw=False,
+                level=0,
+                clean=True,
+                remove_doubles=True
+                ):
+    """Cut a copy of the original by the face planes of each cell, instead of a boolean.
+
+    Cut sections are filled like holes, a section with a hole in it gets filled too.
+    """
+    cells_bisect = []
+    view_layer = context.view_layer
+
+    operand = original_cache.operand
+    if use_interior_hide and level == 0:
+        # only set for level 0, before the octree copies the faces.
+        operand.data.polygons.foreach_set("hide", [False] * len(operand.data.polygons))
+
+    for cell in cells_inside:
+        if use_interior_hide:
+            cell.data.polygons.foreach_set("hide", [True] * len(cell.data.polygons))
+        cells_bisect.append(cell)
+
+    # Small cells are cut out of a small part of a dense original.
+    octree = original_cache.octree()
+
+    for cell in cells:
+        mesh = cell.data
+        matrix = cell.matrix_world.copy()
+        matrix_normal = matrix.inverted_safe().transposed().to_3x3()
+        bm = octree.piece(*_object_minmax(cell)).copy()
+        for polygon in mesh.polygons:
+            # The new faces are the cell's own, so interior ones.
+            _bmesh_bisect_fill(bm, matrix @ polygon.center, (matrix_normal @ polygon.normal).normalized(),
+                               material_index=polygon.material_index,
+                               smooth=polygon.use_smooth,
+                               hide=use_interior_hide)
+            if not bm.faces:
+                break
+
+        if not bm.faces:
+            # Nothing of the original is inside this cell.
+            bm.free()
+            bpy.data.objects.remove(cell, do_unlink=True)
+            if not mesh.users:
+                bpy.data.meshes.remove(mesh)
+            continue
+
+        bm.transform(matrix.inverted())
+        _bmesh_clean(bm, clean=clean, remove_doubles=remove_doubles)
+        bm.to_mesh(mesh)
+        bm.free()
+        cells_bisect.append(cell)
+
+        if use_debug_redraw:
+            _redraw_yasiamevil()
+
+    if use_island_split:
+        cells_bisect = cells_island_split(context, cells_bisect)
+
+    view_layer.update()
+    return cells_bisect
+
+
+def cells_island_split(context, cells):
+    """Separate the disconnected parts of each cell into their own objects.
+
+    Returns each cell followed by its other parts, the first part stays in the cell.
+    """
+    cells_split = []
+    for cell in cells:
+        cells_split.append(cell)
+        mesh = cell.data
+        edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+        mesh.edges.foreach_get("vertices", edges)
+        vert_islands = topology.vert_islands(edges, len(mesh.vertices))
+
+        arrays = _mesh_arrays(mesh)
+        face_islands = vert_islands[arrays["loops"][arrays["loop_start"]]]
+        islands = np.unique(face_islands)
+        if len(islands) < 2:
+            continue
+        for island in islands[1:].tolist():
+            mesh_dst = _mesh_part(mesh, arrays, np.flatnonzero(face_islands == island), cell.name)
+            cells_split.append(_object_part(cell, mesh_dst, cell.matrix_world))
+        _mesh_remove_faces(mesh, np.flatnonzero(face_islands != islands[0]))
+
+    return cells_split
 
 
 def interior_handle(cells,
@@ -565,37 +1616,10 @@ def post_process(cells,
                 #cell.game.mass = mass
                 cell[mass_name] = mass
         elif mass_mode == 'VOLUME':
-            from mathutils import Vector
-            def _get_volume(cell):
-                def _getObjectBBMinMax():
-                    min_co = Vector((1000000.0, 1000000.0, 1000000.0))
-                    max_co = -min_co
-                    matrix = cell.matrix_world
-                    for i in range(0, 8):
-                        bb_vec = cell.matrix_world @ Vector(cell.bound_box[i])
-                        min_co[0] = min(bb_vec[0], min_co[0])
-                        min_co[1] = min(bb_vec[1], min_co[1])
-                        min_co[2] = min(bb_vec[2], min_co[2])
-                        max_co[0] = max(bb_vec[0], max_co[0])
-                        max_co[1] = max(bb_vec[1], max_co[1])
-                        max_co[2] = max(bb_vec[2], max_co[2])
-                    return (min_co, max_co)
-
-                def _getObjectVolume():
-                    min_co, max_co = _getObjectBBMinMax()
-                    x = max_co[0] - min_co[0]
-                    y = max_co[1] - min_co[1]
-                    z = max_co[2] - min_co[2]
-                    volume = x * y * z
-                    return volume
-
-                return _getObjectVolume()
-
-            cell_volume_ls = [_get_volume(cell) for cell in cells]
-            cell_volume_tot = sum(cell_volume_ls)
-            if cell_volume_tot > 0.0:
-                mass_fac = mass / cell_volume_tot
-                for i, cell in enumerate(cells):
-                    cell[mass_name] = cell_volume_ls[i] * mass_fac
+            cell_volume_ls = [volume.bound_box_volume(cell.matrix_world, cell.bound_box) for cell in cells]
+            cell_mass_ls = volume.mass_by_volume(cell_volume_ls, mass)
+            if cell_mass_ls is not None:
+                for cell, cell_mass in zip(cells, cell_mass_ls.tolist()):
+                    cell[mass_name] = cell_mass
         else:
             assert(0)
\ No newline at end of file
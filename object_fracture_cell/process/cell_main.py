@@ -8,8 +8,128 @@ else:
 import bpy
 
 
-def main_object(context, original, level, **kw):
+def _memory_used():
+    """Memory used by Blender in bytes, None when it can't be known here"""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        import resource
+    except ImportError:
+        # Windows without psutil.
+        return None
+    import sys
+    # Peak rather than current use, in kilobytes on Linux and bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+class RecursionBudget:
+    """Limits of the recursion, checked before each batch of cells is broken again.
+
+    Zero disables a limit. The time limit counts from the start of the fracture,
+    batches are cut short to the cells that fit in it at their average time so far.
+    """
+    # Cells broken between checks of the time, faces and memory limits.
+    BATCH_SIZE = 16
+
+    def __init__(self, time_start, cells_total=0, polys_total=0,
+                 clamp=0, time_limit=0.0, poly_limit=0, memory_limit=0):
+        import time
+        # From time.perf_counter().
+        self.time_start = time_start
+        self.clamp = clamp
+        self.time_limit = time_limit
+        self.poly_limit = poly_limit
+        # In megabytes like the property.
+        self.memory_limit = memory_limit * 1024 * 1024
+        self.cells_total = cells_total
+        self.polys_total = polys_total
+        self.time_cells = 0.0
+        self.cells_done = 0
+        self.time_batch_start = time.perf_counter()
+        self.reason = None
+
+    def add(self, cells_total, polys_total):
+        """Count cells made before the recursion, e.g. by the geometry recursion"""
+        self.cells_total += cells_total
+        self.polys_total += polys_total
+
+    def batch(self, cells_queue, source_limit):
+        """The next cells of the queue to break, none once a limit is reached"""
+        import time
+        if self.exceeded():
+            return []
+        size = len(cells_queue)
+        if self.time_limit or self.poly_limit or self.memory_limit:
+            size = min(size, self.BATCH_SIZE)
+        if self.clamp:
+            # Each broken cell adds up to source_limit - 1 cells.
+            size = min(size, -(-(self.clamp - self.cells_total) // max(source_limit - 1, 1)))
+        # Batches too fast to be timed don't tell the time of a cell yet.
+        if self.time_limit and self.time_cells > 0.0:
+            time_left = self.time_limit - (time.perf_counter() - self.time_start)
+            size = min(size, int(time_left / (self.time_cells / self.cells_done)))
+            if size <= 0:
+                self.reason = "time"
+                return []
+        self.time_batch_start = time.perf_counter()
+        return cells_queue[:size]
+
+    def batch_done(self, cells_broken, cells_new, polys_broken, polys_new):
+        """Count a batch of cells broken into new ones"""
+        import time
+        self.time_cells += time.perf_counter() - self.time_batch_start
+        self.cells_done += cells_broken
+        self.cells_total += cells_new - cells_broken
+        self.polys_total += polys_new - polys_broken
+
+    def exceeded(self):
+        """Why the recursion has to stop, None while it can go on"""
+        import time
+        self.reason = None
+        if self.clamp and self.cells_total >= self.clamp:
+            self.reason = "cells"
+        elif self.poly_limit and self.polys_total >= self.poly_limit:
+            self.reason = "faces"
+        elif self.time_limit and time.perf_counter() - self.time_start >= self.time_limit:
+            self.reason = "time"
+        elif self.memory_limit and (_memory_used() or 0) >= self.memory_limit:
+            self.reason = "memory"
+        return self.reason
+
+
+def _recursion_queue(cells, recursion_chance, recursion_chance_select, cursor):
+    """The cells to break again, most wanted first"""
     import random
+    from mathutils import Vector
+
+    cells_queue = list(cells)
+    if recursion_chance_select == 'RANDOM':
+        random.shuffle(cells_queue)
+    elif recursion_chance_select in {'SIZE_MIN', 'SIZE_MAX'}:
+        cells_queue.sort(key=lambda cell:
+            (Vector(cell.bound_box[0]) - Vector(cell.bound_box[6])).length_squared,
+            reverse=(recursion_chance_select == 'SIZE_MAX'))
+    elif recursion_chance_select in {'CURSOR_MIN', 'CURSOR_MAX'}:
+        cells_queue.sort(key=lambda cell: (cell.location - cursor).length_squared,
+                         reverse=(recursion_chance_select == 'CURSOR_MAX'))
+    if recursion_chance != 1.0:
+        cells_queue[int(recursion_chance * len(cells_queue)):] = []
+    return cells_queue
+
+
+def main_object(context, original, level, original_caches, **kw):
+    return main_objects(context, [original], level, original_caches, **kw)
+
+
+def main_objects(context, originals, level, original_caches, **kw):
+    """Fracture each of the originals, the cells of all of them are made and cut together."""
+    import time
+    time_start = time.perf_counter()
 
     # pull out some args
     kw_copy = kw.copy()
@@ -19,11 +139,16 @@ def main_object(context, original, level, **kw):
     source_particle_child = kw_copy.pop("source_particle_child")
     source_pencil = kw_copy.pop("source_pencil")
     source_random = kw_copy.pop("source_random")
+    source_random_bounds = kw_copy.pop("source_random_bounds")
     
     use_recenter = kw_copy.pop("use_recenter")
     recursion = kw_copy.pop("recursion")
+    recursion_mode = kw_copy.pop("recursion_mode")
     recursion_source_limit = kw_copy.pop("recursion_source_limit")
     recursion_clamp = kw_copy.pop("recursion_clamp")
+    recursion_time_limit = kw_copy.pop("recursion_time_limit")
+    recursion_poly_limit = kw_copy.pop("recursion_poly_limit")
+    recursion_memory_limit = kw_copy.pop("recursion_memory_limit")
     recursion_chance = kw_copy.pop("recursion_chance")
     recursion_chance_select = kw_copy.pop("recursion_chance_select")
     use_island_split = kw_copy.pop("use_island_split")
@@ -33,44 +158,133 @@ def main_object(context, original, level, **kw):
     use_sharp_edges_apply = kw_copy.pop("use_sharp_edges_apply")
 
     cell_relocate = kw_copy.pop("cell_relocate")
+    cell_engine = kw_copy.pop("cell_engine")
+    boolean_workers = kw_copy.pop("boolean_workers")
 
     collection = context.collection
     scene = context.scene
 
+    # Packed cells stay in one object, they are not split or broken again.
+    use_packed = kw_copy["cell_output"] == 'PACKED'
+    if use_packed:
+        use_island_split = False
+        recursion = 0
+
+    # Geometry recursion breaks the cells before they are made, in points_to_cells.
+    cell_recursion = None
+    if recursion_mode == 'GEOMETRY' and recursion and level == 0:
+        cell_recursion = {
+            "recursion": recursion,
+            "source_limit": recursion_source_limit,
+            "clamp": recursion_clamp,
+            "chance": recursion_chance,
+            "chance_select": recursion_chance_select,
+            "cursor": scene.cursor.location[:],
+            "budget": None,
+            }
+        if recursion_time_limit or recursion_poly_limit or recursion_memory_limit:
+            # One budget for the cells of all originals, the cell count is clamped by cellset_recurse.
+            cell_recursion["budget"] = RecursionBudget(time_start,
+                                                       time_limit=recursion_time_limit,
+                                                       poly_limit=recursion_poly_limit,
+                                                       memory_limit=recursion_memory_limit)
+        recursion = 0
+
     if level != 0:
         kw_copy["source_limit"] = recursion_source_limit
 
     from . import cell_functions
 
-    # not essential but selection is visual distraction.
-    original.select_set(False)
+    original_caches_level = []
+    display_types_prev = []
+    points_groups = []
+    originals_convex = []
+    for original in originals:
+        # not essential but selection is visual distraction.
+        original.select_set(False)
 
-    if kw_copy["use_debug_redraw"]:
-        original_display_type_prev = original.display_type
-        original.display_type = 'WIRE'
-    
-    original_mesh = original.data
-    original_matrix = original.matrix_world.copy()
-    original_verts = [original_matrix @ v.co for v in original_mesh.vertices]    
-    original_xyz_minmax = cell_functions.original_minmax(original_verts)
-    
-    cells = []
-    points = cell_functions.points_from_object(original, original_xyz_minmax,
-                                               source_vert_own=source_vert_own,
-                                               source_vert_child=source_vert_child,
-                                               source_particle_own=source_particle_own,
-                                               source_particle_child=source_particle_child,
-                                               source_pencil=source_pencil,
-                                               source_random=source_random)        
-
-    cells = cell_functions.points_to_cells(context, original, original_xyz_minmax, points, **kw_copy)        
-    cells = cell_functions.cell_boolean(context, original, cells,
-                                        use_island_split=use_island_split,
-                                        use_interior_hide=(use_interior_vgroup or use_sharp_edges),
-                                        use_debug_bool=use_debug_bool,
-                                        use_debug_redraw=kw_copy["use_debug_redraw"],
-                                        level=level,
-                                        )
+        if kw_copy["use_debug_redraw"]:
+            display_types_prev.append(original.display_type)
+            original.display_type = 'WIRE'
+
+        # Everything the cells need of the original is read once, and freed by main()
+        # or, for the cells of the recursion, once they are broken.
+        original_cache = cell_functions.OriginalCache(context, original)
+        original_caches.append(original_cache)
+        original_caches_level.append(original_cache)
+
+        points_groups.append(cell_functions.points_from_object(original, original_cache.minmax(),
+                                                               source_vert_own=source_vert_own,
+                                                               source_vert_child=source_vert_child,
+                                                               source_particle_own=source_particle_own,
+                                                               source_particle_child=source_particle_child,
+                                                               source_pencil=source_pencil,
+                                                               source_random=source_random,
+                                                               original_bvh=(original_cache.bvh()
+                                                                             if source_random_bounds == 'VOLUME' else None)))
+
+        # Convex originals (bricks, planks...) clip the cells by their faces, without a boolean.
+        original_convex = None
+        if not use_debug_bool:
+            original_convex = original_cache.convex(use_data_match=kw_copy["use_data_match"],
+                                                    use_hide=(level != 0))
+        originals_convex.append(original_convex)
+
+    if len(originals) == 1:
+        cells_groups = [cell_functions.points_to_cells(context, originals[0], original_caches_level[0],
+                                                       points_groups[0],
+                                                       original_convex=originals_convex[0],
+                                                       use_interior_hide=(use_interior_vgroup or use_sharp_edges),
+                                                       use_debug_bool=use_debug_bool,
+                                                       cell_recursion=cell_recursion,
+                                                       **kw_copy)]
+    else:
+        # One Voronoi pass for the cells of all originals.
+        kw_batch = kw_copy.copy()
+        del kw_batch["cell_backend"]
+        cells_groups = cell_functions.points_to_cells_batch(context, originals, original_caches_level,
+                                                            points_groups, originals_convex,
+                                                            use_interior_hide=(use_interior_vgroup or use_sharp_edges),
+                                                            use_debug_bool=use_debug_bool,
+                                                            **kw_batch)
+    # The convex originals are done, the boolean ones are cut together.
+    cells_groups_done = [None] * len(originals)
+    groups_boolean = []
+    for i, (original_convex, (cells, cells_inside)) in enumerate(zip(originals_convex, cells_groups)):
+        if original_convex is not None:
+            cells_groups_done[i] = cells
+        elif cell_engine == 'BISECT' and not use_debug_bool:
+            cells_groups_done[i] = cell_functions.cell_bisect(context, original_caches_level[i], cells,
+                                                              cells_inside=cells_inside,
+                                                              use_island_split=use_island_split,
+                                                              use_interior_hide=(use_interior_vgroup or use_sharp_edges),
+                                                              use_debug_redraw=kw_copy["use_debug_redraw"],
+                                                              level=level,
+                                                              )
+        else:
+            groups_boolean.append(i)
+    if groups_boolean:
+        cells_boolean_groups = cell_functions.cell_boolean_batch(
+                context,
+                [original_caches_level[i] for i in groups_boolean],
+                [cells_groups[i][0] for i in groups_boolean],
+                [cells_groups[i][1] for i in groups_boolean],
+                use_island_split=use_island_split,
+                use_interior_hide=(use_interior_vgroup or use_sharp_edges),
+                use_debug_bool=use_debug_bool,
+                use_debug_redraw=kw_copy["use_debug_redraw"],
+                level=level,
+                boolean_workers=boolean_workers,
+                )
+        for i, cells in zip(groups_boolean, cells_boolean_groups):
+            cells_groups_done[i] = cells
+    if use_packed and not use_debug_bool:
+        # Each cell had its own boolean, the packed object is only made now,
+        # so the boolean never sees a mesh of cells touching each other.
+        for i, original_convex in enumerate(originals_convex):
+            if original_convex is None and cells_groups_done[i]:
+                cells_groups_done[i] = [cell_functions.cells_pack(context, cells_groups_done[i])]
+    cells = [cell for cells in cells_groups_done for cell in cells]
 
     # must apply after boolean.
     if use_recenter:
@@ -79,48 +293,49 @@ def main_object(context, original, level, **kw):
                                   
     #--------------
     # Recursion.
-    if level == 0:
+    # Breadth first: every level is done before the next one, so when a limit
+    # is reached the cells are evenly broken, the most wanted ones first.
+    # The cells of a level are broken together, in batches when there are limits to check.
+    if level == 0 and recursion:
+        budget = RecursionBudget(time_start, len(cells), sum(len(cell.data.polygons) for cell in cells),
+                                 clamp=recursion_clamp,
+                                 time_limit=recursion_time_limit,
+                                 poly_limit=recursion_poly_limit,
+                                 memory_limit=recursion_memory_limit)
         for level_sub in range(1, recursion + 1):
+            cells_queue = _recursion_queue(cells, recursion_chance, recursion_chance_select,
+                                           scene.cursor.location.copy())
 
-            objects_recurse_input = [(i, o) for i, o in enumerate(cells)]
-            if recursion_chance != 1.0:
-                from mathutils import Vector
-                if recursion_chance_select == 'RANDOM':
-                    random.shuffle(objects_recurse_input)
-                elif recursion_chance_select in {'SIZE_MIN', 'SIZE_MAX'}:
-                    objects_recurse_input.sort(key=lambda ob_pair:
-                        (Vector(ob_pair[1].bound_box[0]) -
-                         Vector(ob_pair[1].bound_box[6])).length_squared)
-                    if recursion_chance_select == 'SIZE_MAX':
-                        objects_recurse_input.reverse()
-                elif recursion_chance_select in {'CURSOR_MIN', 'CURSOR_MAX'}:
-                    c = scene.cursor.location.copy()
-                    objects_recurse_input.sort(key=lambda ob_pair:
-                        (ob_pair[1].location - c).length_squared)
-                    if recursion_chance_select == 'CURSOR_MAX':
-                        objects_recurse_input.reverse()
-            
-                objects_recurse_input[int(recursion_chance * len(objects_recurse_input)):] = []
-                objects_recurse_input.sort()
-            
-            # reverse index values so we can remove from original list.
-            objects_recurse_input.reverse()
-
+            cells_broken = set()
             objects_recursive = []
-            for i, obj_cell in objects_recurse_input:
-                assert(cells[i] is obj_cell)
-                # Repeat main_object() here.
-                objects_recursive += main_object(context, obj_cell, level_sub, **kw)
-                #if original_remove:
-                collection.objects.unlink(obj_cell)
-                del cells[i]
-                if recursion_clamp and len(cells) + len(objects_recursive) >= recursion_clamp:
+            while cells_queue:
+                cells_batch = budget.batch(cells_queue, recursion_source_limit)
+                if not cells_batch:
                     break
+                del cells_queue[:len(cells_batch)]
+                # Repeat main_objects() here.
+                caches_start = len(original_caches)
+                cells_sub = main_objects(context, cells_batch, level_sub, original_caches, **kw)
+                # The broken cells aren't needed again, free their caches now rather than in main().
+                for original_cache in original_caches[caches_start:]:
+                    original_cache.free()
+                del original_caches[caches_start:]
+                budget.batch_done(len(cells_batch), len(cells_sub),
+                                  sum(len(cell.data.polygons) for cell in cells_batch),
+                                  sum(len(cell_sub.data.polygons) for cell_sub in cells_sub))
+                objects_recursive += cells_sub
+                for obj_cell in cells_batch:
+                    #if original_remove:
+                    collection.objects.unlink(obj_cell)
+                    cells_broken.add(obj_cell)
+            cells = [cell for cell in cells if cell not in cells_broken]
             cells.extend(objects_recursive)
 
-            if recursion_clamp and len(cells) > recursion_clamp:
+            if budget.reason is not None:
+                print("Cell Fracture: recursion stopped at level %d, %s limit reached" %
+                      (level_sub, budget.reason))
                 break
-    
+
     #--------------
     # Level Options
     if level == 0:
@@ -133,11 +348,16 @@ def main_object(context, original, level, **kw):
                                            )
     
     if cell_relocate:
-        for cell in cells:
-            cell.location.x += (original_xyz_minmax["x"][1] - original_xyz_minmax["x"][0]) + 1
+        # Cells of the recursion move with the cells of the first level.
+        for original_cache, cells_original in zip(original_caches_level,
+                                                  [cells] if level == 0 else cells_groups_done):
+            original_xyz_minmax = original_cache.minmax()
+            for cell in cells_original:
+                cell.location.x += (original_xyz_minmax["x"][1] - original_xyz_minmax["x"][0]) + 1
     
     if kw_copy["use_debug_redraw"]:
-        original.display_type = original_display_type_prev
+        for original, display_type_prev in zip(originals, display_types_prev):
+            original.display_type = display_type_prev
     
     return cells
 
@@ -170,10 +390,15 @@ def main(context, original, **kw):
         if pre_simplify > 0.0:
             cell_functions.simplify_original(original=original, pre_simplify=pre_simplify)
         
-        cells += main_object(context, original, 0, **kw_copy)
-        
-        if pre_simplify > 0.0:
-            cell_functions.desimplify_original(original=original)
+        original_caches = []
+        try:
+            cells += main_object(context, original, 0, original_caches, **kw_copy)
+        finally:
+            # Also when the fracture fails, so no baked operand or decimate is left behind.
+            for original_cache in original_caches:
+                original_cache.free()
+            if pre_simplify > 0.0:
+                cell_functions.desimplify_original(original=original)
     else:
         assert obj.type == 'MESH', "No MESH object selected."
 
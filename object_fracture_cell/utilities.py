@@ -7,15 +7,25 @@ def _cell_props_to_dict(fracture_cell_props):
         'source_particle_child': fracture_cell_props.source_particle_child,
         'source_pencil': fracture_cell_props.source_pencil,
         'source_random': fracture_cell_props.source_random,
+        'source_random_bounds': fracture_cell_props.source_random_bounds,
         'source_noise': fracture_cell_props.source_noise,
         'margin': fracture_cell_props.margin,
         'cell_scale': fracture_cell_props.cell_scale,
+        'cell_processes': fracture_cell_props.cell_processes,
+        'cell_backend': fracture_cell_props.cell_backend,
+        'cell_bounds': fracture_cell_props.cell_bounds,
+        'cell_engine': fracture_cell_props.cell_engine,
+        'boolean_workers': fracture_cell_props.boolean_workers,
         'pre_simplify': fracture_cell_props.pre_simplify,
         'use_recenter': fracture_cell_props.use_recenter,
         'use_island_split': fracture_cell_props.use_island_split,
         'recursion': fracture_cell_props.recursion,
+        'recursion_mode': fracture_cell_props.recursion_mode,
         'recursion_source_limit': fracture_cell_props.recursion_source_limit,
         'recursion_clamp': fracture_cell_props.recursion_clamp,
+        'recursion_time_limit': fracture_cell_props.recursion_time_limit,
+        'recursion_poly_limit': fracture_cell_props.recursion_poly_limit,
+        'recursion_memory_limit': fracture_cell_props.recursion_memory_limit,
         'recursion_chance': fracture_cell_props.recursion_chance,
         'recursion_chance_select': fracture_cell_props.recursion_chance_select,
         'use_smooth_faces': fracture_cell_props.use_smooth_faces,
@@ -30,6 +40,7 @@ def _cell_props_to_dict(fracture_cell_props):
         'collection_name': fracture_cell_props.collection_name,
         'original_hide': fracture_cell_props.original_hide,
         'cell_relocate': fracture_cell_props.cell_relocate,
+        'cell_output': fracture_cell_props.cell_output,
         'use_mass': fracture_cell_props.use_mass,
         'mass_name': fracture_cell_props.mass_name,
         'mass_mode': fracture_cell_props.mass_mode,
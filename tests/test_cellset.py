@@ -0,0 +1,157 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+"""Cells tile their box, CellSet keeps them whole through take, concatenate and packed.
+
+Plain Python, no Blender needed: ``python tests/test_cellset.py`` or pytest.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Appended, the add-on's operator.py would hide the standard library one.
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "object_fracture_cell"))
+
+from core import voronoi
+from core.cellset import CellSet
+
+
+def _volumes(cellset):
+    """Volume of each cell, from the signed volumes of its faces fanned from the center."""
+    volumes = np.zeros(len(cellset))
+    for i in range(len(cellset)):
+        verts = cellset.cell_verts(i).astype(np.float64)
+        for face in cellset.cell_faces(i):
+            co = verts[face]
+            volumes[i] += (co[0] * np.cross(co[1:-1], co[2:])).sum() / 6.0
+    return volumes
+
+
+def _cellset(points_total=60, seed=0):
+    rng = np.random.default_rng(seed)
+    points_co = rng.uniform((0.0, 0.0, 0.0), (2.0, 1.0, 0.5), (points_total, 3))
+    return voronoi.points_to_cellset(points_co, (0.0, 0.0, 0.0), (2.0, 1.0, 0.5),
+                                     margin_bounds=0.0,
+                                     sources=rng.choice(("VERTS", "RANDOM"), points_total))
+
+
+def _assert_cellsets_equal(cellset, expected):
+    assert len(cellset) == len(expected)
+    for attr in ("vert_offsets", "loops", "face_offsets", "cell_face_offsets",
+                 "seed_ids", "seed_sources", "face_planes"):
+        np.testing.assert_array_equal(getattr(cellset, attr), getattr(expected, attr))
+    np.testing.assert_allclose(cellset.verts, expected.verts)
+    np.testing.assert_allclose(cellset.centers, expected.centers)
+    assert cellset.source_names == expected.source_names
+
+
+def test_cells_tile_box():
+    cellset = _cellset()
+    assert len(cellset) == 60
+    volumes = _volumes(cellset)
+    assert (volumes > 0.0).all()
+    np.testing.assert_allclose(volumes.sum(), 2.0 * 1.0 * 0.5, rtol=1e-5)
+    # Each cell is around its own seed.
+    for i in range(len(cellset)):
+        planes = cellset.cell_planes(i)
+        assert (planes[:, 3] < 0.0).all()
+
+
+def test_cells_scaled_tile_box():
+    rng = np.random.default_rng(1)
+    points_co = rng.uniform(0.0, 1.0, (40, 3))
+    cellset = voronoi.points_to_cellset(points_co, (0.0, 0.0, 0.0), (1.0, 1.0, 1.0),
+                                        points_scale=(1.0, 0.25, 2.0),
+                                        margin_bounds=0.0)
+    np.testing.assert_allclose(_volumes(cellset).sum(), 1.0, rtol=1e-5)
+
+
+def test_take_concatenate():
+    cellset = _cellset()
+    order = np.random.default_rng(2).permutation(len(cellset))
+    taken = cellset.take(order)
+    np.testing.assert_array_equal(taken.seed_ids, cellset.seed_ids[order])
+    np.testing.assert_allclose(_volumes(taken), _volumes(cellset)[order], rtol=1e-6)
+    for i, j in enumerate(order.tolist()):
+        assert taken.cell_faces(i) == cellset.cell_faces(j)
+        assert taken.source(i) == cellset.source(j)
+
+    # Back in order, from two parts.
+    parts = [taken.take(np.argsort(order)[:20]), taken.take(np.argsort(order)[20:])]
+    _assert_cellsets_equal(CellSet.concatenate(parts), cellset)
+    _assert_cellsets_equal(CellSet.concatenate([CellSet.empty(), cellset]), cellset)
+    assert len(cellset.take([])) == 0
+
+
+def test_packed():
+    cellset = _cellset()
+    verts, loops, loop_starts, loop_totals, face_cells, vert_cells = cellset.packed()
+    assert len(face_cells) == len(loop_starts) == cellset.cell_face_offsets[-1]
+    assert len(vert_cells) == len(verts)
+    np.testing.assert_array_equal(np.bincount(face_cells), np.diff(cellset.cell_face_offsets))
+    # Faces only use the vertices of their own cell.
+    np.testing.assert_array_equal(vert_cells[loops], np.repeat(face_cells, loop_totals))
+
+    # The cell ids give back each cell, moved to its center.
+    for i in range(len(cellset)):
+        faces = np.flatnonzero(face_cells == i)
+        faces_packed = [(loops[start:start + total] - cellset.vert_offsets[i]).tolist()
+                        for start, total in zip(loop_starts[faces].tolist(), loop_totals[faces].tolist())]
+        assert faces_packed == cellset.cell_faces(i)
+        np.testing.assert_allclose(verts[vert_cells == i], cellset.cell_verts(i) + cellset.centers[i], atol=1e-6)
+
+
+def test_subdivide_tiles_parent():
+    np.random.seed(0)
+    cellset = _cellset(20)
+    indices = [3, 0, 11]
+    subdivided = voronoi.subdivide_cells(cellset, indices, 6)
+    volumes = _volumes(cellset)
+    volumes_sub = _volumes(subdivided)
+    assert (volumes_sub > 0.0).all()
+    np.testing.assert_allclose(volumes_sub.sum(), volumes.sum(), rtol=1e-5)
+
+    # The other cells come first, untouched, then the children of each cell.
+    keep = np.setdiff1d(np.arange(len(cellset)), indices)
+    _assert_cellsets_equal(subdivided.take(np.arange(len(keep))), cellset.take(keep))
+    children = subdivided.take(np.arange(len(keep), len(subdivided)))
+    for i in indices:
+        child_mask = children.seed_ids == cellset.seed_ids[i]
+        assert child_mask.sum() > 1
+        np.testing.assert_allclose(_volumes(children)[child_mask].sum(), volumes[i], rtol=1e-5)
+        assert all(children.source(j) == cellset.source(i) for j in np.flatnonzero(child_mask).tolist())
+        # Children stay inside their parent.
+        planes = cellset.cell_planes(i)
+        planes[:, 3] -= planes[:, :3] @ cellset.centers[i]
+        for j in np.flatnonzero(child_mask).tolist():
+            co = children.cell_verts(j).astype(np.float64) + children.centers[j]
+            assert (co @ planes[:, :3].T + planes[:, 3] <= 1e-5).all()
+
+
+if __name__ == "__main__":
+    test_cells_tile_box()
+    test_cells_scaled_tile_box()
+    test_take_concatenate()
+    test_packed()
+    test_subdivide_tiles_parent()
+    print("OK")
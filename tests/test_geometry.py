@@ -0,0 +1,151 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+"""ConvexCell cuts, PointGrid queries and vert_islands, against plain brute force.
+
+Plain Python, no Blender needed: ``python tests/test_geometry.py`` or pytest.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Appended, the add-on's operator.py would hide the standard library one.
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "object_fracture_cell"))
+
+from core.polytope import ConvexCell
+from core.spatial import PointGrid
+from core.topology import vert_islands
+
+# Unit cube from the origin, as (x, y, z, scaler) planes keeping n.x + d <= 0.
+CUBE = [(-1.0, 0.0, 0.0, 0.0), (1.0, 0.0, 0.0, -1.0),
+        (0.0, -1.0, 0.0, 0.0), (0.0, 1.0, 0.0, -1.0),
+        (0.0, 0.0, -1.0, 0.0), (0.0, 0.0, 1.0, -1.0)]
+
+
+def _volume(cell):
+    """Volume of a ConvexCell, negative when its faces point in."""
+    verts = np.array(cell.verts, dtype=np.float64)
+    volume = 0.0
+    for face in cell.faces:
+        co = verts[face]
+        volume += (co[0] * np.cross(co[1:-1], co[2:])).sum() / 6.0
+    return volume
+
+
+def test_convex_cell_cube():
+    cell = ConvexCell(CUBE)
+    assert cell
+    assert len(cell.faces) == 6
+    assert sorted(cell.face_planes) == list(range(6))
+    np.testing.assert_allclose(_volume(cell), 1.0)
+    np.testing.assert_allclose(cell.radius_squared(), 3.0)
+
+
+def test_convex_cell_cut():
+    cell = ConvexCell(CUBE)
+    # A redundant plane leaves the cell as it is.
+    assert cell.cut((1.0, 0.0, 0.0, -2.0), 6)
+    assert len(cell.faces) == 6
+    # Cut off a corner: a tetrahedron of volume 1/6.
+    normal = np.array((1.0, 1.0, 1.0)) / np.sqrt(3.0)
+    assert cell.cut((*normal, -2.0 / np.sqrt(3.0)), 7)
+    np.testing.assert_allclose(_volume(cell), 1.0 - 1.0 / 6.0)
+    assert len(cell.faces) == 7
+    assert cell.face_planes.count(7) == 1
+    # Every vertex of the cap lies on its plane.
+    cap = cell.faces[cell.face_planes.index(7)]
+    co = np.array(cell.verts)[cap]
+    np.testing.assert_allclose(co @ normal, 2.0 / np.sqrt(3.0))
+    # Each edge is used by two faces, once in each direction.
+    edges = [(face[i - 1], face[i]) for face in cell.faces for i in range(len(face))]
+    assert len(set(edges)) == len(edges)
+    assert set(edges) == set((b, a) for a, b in edges)
+
+    # Nothing is left past the far corner.
+    assert not cell.cut((-1.0, 0.0, 0.0, 2.0), 8)
+    assert not cell
+
+
+def test_convex_cell_slices_tile():
+    rng = np.random.default_rng(0)
+    normal = rng.normal(size=3)
+    normal /= np.linalg.norm(normal)
+    cuts = np.sort(rng.uniform(-0.5, 1.5, 4))
+    volume = 0.0
+    for d_lo, d_hi in zip(np.concatenate(([-3.0], cuts)), np.concatenate((cuts, [3.0]))):
+        planes = CUBE + [(*normal, -d_hi), (*-normal, d_lo)]
+        cell = ConvexCell(planes)
+        if cell:
+            volume += _volume(cell)
+    np.testing.assert_allclose(volume, 1.0)
+
+
+def test_point_grid():
+    rng = np.random.default_rng(0)
+    co = rng.uniform((0.0, 0.0, 0.0), (4.0, 1.0, 0.25), (500, 3))
+    grid = PointGrid(co)
+    assert len(grid) == 500
+    for query in rng.uniform(-1.0, 5.0, (50, 3)):
+        distances = np.sqrt(((co - query) ** 2).sum(axis=1))
+        index, distance = grid.find(query)
+        assert distance == distances.min()
+        assert distances[index] == distance
+        indices, found = grid.find_range(query, 0.5)
+        assert sorted(indices.tolist()) == np.flatnonzero(distances <= 0.5).tolist()
+        assert (np.diff(found) >= 0.0).all()
+    assert grid.covers((2.0, 0.5, 0.125), 3.0)
+    assert not grid.covers((2.0, 0.5, 0.125), 0.5)
+
+
+def test_point_grid_flat_empty():
+    # All points on a plane.
+    rng = np.random.default_rng(1)
+    co = np.zeros((200, 3))
+    co[:, :2] = rng.uniform(0.0, 1.0, (200, 2))
+    grid = PointGrid(co)
+    assert np.prod(grid.dims) <= 8 * len(co) + 8
+    index, distance = grid.find((0.5, 0.5, 1.0))
+    np.testing.assert_allclose(distance, np.sqrt(((co - (0.5, 0.5, 1.0)) ** 2).sum(axis=1)).min())
+
+    grid = PointGrid(np.zeros((0, 3)))
+    assert grid.find((0.0, 0.0, 0.0)) == (-1, float("inf"))
+    assert len(grid.find_range((0.0, 0.0, 0.0), 1.0)[0]) == 0
+
+
+def test_vert_islands():
+    # A triangle, a chain of four vertices and two loose ones, edges out of order.
+    edges = [(5, 6), (0, 1), (4, 3), (1, 2), (2, 0), (3, 5)]
+    np.testing.assert_array_equal(vert_islands(edges, 9), [0, 0, 0, 1, 1, 1, 1, 2, 3])
+    # Flat edge indices, and a chain joined from its far end.
+    np.testing.assert_array_equal(vert_islands([3, 2, 2, 1, 1, 0], 5), [0, 0, 0, 0, 1])
+    np.testing.assert_array_equal(vert_islands([], 3), [0, 1, 2])
+
+
+if __name__ == "__main__":
+    test_convex_cell_cube()
+    test_convex_cell_cut()
+    test_convex_cell_slices_tile()
+    test_point_grid()
+    test_point_grid_flat_empty()
+    test_vert_islands()
+    print("OK")
@@ -0,0 +1,100 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+"""The 'VORONOI' backend gives the cells of the 'GRID' one (needs SciPy).
+
+Plain Python, no Blender needed: ``python tests/test_voronoi_backend.py`` or pytest.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Appended, the add-on's operator.py would hide the standard library one.
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "object_fracture_cell"))
+
+from core import voronoi
+
+
+def _volumes(cellset):
+    """Volume of each cell, from the signed volumes of its faces fanned from the center."""
+    volumes = np.zeros(len(cellset))
+    for i in range(len(cellset)):
+        verts = cellset.cell_verts(i).astype(np.float64)
+        for face in cellset.cell_faces(i):
+            co = verts[face]
+            volumes[i] += (co[0] * np.cross(co[1:-1], co[2:])).sum() / 6.0
+    return volumes
+
+
+def _check_backends(points_co, xyz_min, xyz_max, **kw):
+    if not voronoi.voronoi_available():
+        print("SciPy isn't installed, skipped")
+        return
+    cells_grid = voronoi.points_to_cellset(points_co, xyz_min, xyz_max, backend='GRID', **kw)
+    cells_voronoi = voronoi.points_to_cellset(points_co, xyz_min, xyz_max, backend='VORONOI', **kw)
+    np.testing.assert_array_equal(cells_voronoi.seed_ids, cells_grid.seed_ids)
+    np.testing.assert_allclose(cells_voronoi.centers, cells_grid.centers)
+    volumes = _volumes(cells_voronoi)
+    # Faces point out of the cells.
+    assert (volumes > 0.0).all()
+    np.testing.assert_allclose(volumes, _volumes(cells_grid), rtol=1e-4, atol=1e-9)
+    # Faces on the clip planes are found the same.
+    for i in range(len(cells_grid)):
+        faces_grid = cells_grid.face_planes[cells_grid.cell_face_offsets[i]:cells_grid.cell_face_offsets[i + 1]]
+        faces_voronoi = cells_voronoi.face_planes[cells_voronoi.cell_face_offsets[i]:
+                                                  cells_voronoi.cell_face_offsets[i + 1]]
+        assert sorted(set(faces_voronoi.tolist())) == sorted(set(faces_grid.tolist()))
+
+
+def test_random():
+    rng = np.random.default_rng(0)
+    points_co = rng.uniform((0.0, 0.0, 0.0), (2.0, 1.0, 1.0), (400, 3))
+    _check_backends(points_co, (0.0, 0.0, 0.0), (2.0, 1.0, 1.0))
+    _check_backends(points_co, (0.0, 0.0, 0.0), (2.0, 1.0, 1.0), margin_cell=0.01)
+    _check_backends(points_co, (0.0, 0.0, 0.0), (2.0, 1.0, 1.0), margin_cell=0.02, points_scale=(1.0, 0.5, 0.2),
+                    clip_planes=[(0.6, 0.8, 0.0, -1.0)])
+
+
+def test_lattice():
+    # Co-spherical seeds, and a hull of seeds on planes.
+    lattice = np.stack(np.meshgrid(*[np.linspace(0.0, 1.0, 5)] * 3), axis=-1).reshape(-1, 3)
+    _check_backends(lattice, (0.0, 0.0, 0.0), (1.0, 1.0, 1.0))
+    _check_backends(lattice, (0.0, 0.0, 0.0), (1.0, 1.0, 1.0), margin_cell=0.01)
+    rng = np.random.default_rng(1)
+    _check_backends(lattice + rng.normal(0.0, 1e-6, lattice.shape), (0.0, 0.0, 0.0), (1.0, 1.0, 1.0),
+                    margin_cell=0.001)
+
+
+def test_few():
+    # Doubled seeds, and too few seeds for Qhull.
+    rng = np.random.default_rng(2)
+    points_co = rng.uniform(0.0, 1.0, (50, 3))
+    _check_backends(np.concatenate((points_co, points_co[:5])), (0.0, 0.0, 0.0), (1.0, 1.0, 1.0), margin_cell=0.001)
+    _check_backends(points_co[:3], (0.0, 0.0, 0.0), (1.0, 1.0, 1.0))
+
+
+if __name__ == "__main__":
+    test_random()
+    test_lattice()
+    test_few()
+    print("OK")
@@ -0,0 +1,112 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+"""groups_to_cellsets gives each group the cells points_to_cellset gives it alone.
+
+Plain Python, no Blender needed: ``python tests/test_voronoi_groups.py`` or pytest.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Appended, the add-on's operator.py would hide the standard library one.
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "object_fracture_cell"))
+
+from core import voronoi
+
+
+def _plane(normal, co):
+    normal = np.asarray(normal, dtype=np.float64)
+    normal /= np.linalg.norm(normal)
+    return (*normal, -normal.dot(co))
+
+
+def _groups():
+    """Overlapping groups, like the cells of one recursion level, each with its own bounds."""
+    rng = np.random.default_rng(0)
+    groups = []
+    for i, (xyz_min, xyz_max) in enumerate((((0.0, 0.0, 0.0), (2.0, 1.0, 1.0)),
+                                            ((0.5, 0.25, 0.0), (1.5, 1.25, 0.75)),
+                                            ((-1.0, 0.0, 0.5), (0.75, 1.0, 1.5)))):
+        xyz_min = np.array(xyz_min)
+        xyz_max = np.array(xyz_max)
+        center = (xyz_min + xyz_max) / 2.0
+        groups.append({
+            "co": rng.uniform(xyz_min, xyz_max, (40 + 10 * i, 3)),
+            "min": xyz_min,
+            "max": xyz_max,
+            "planes": [_plane((1.0, 1.0, 0.0), xyz_max - 0.1)] if i != 1 else None,
+            "sources": rng.choice(("VERTS", "PARTICLE_OWN", "RANDOM"), 40 + 10 * i),
+            "clip_planes": [_plane((0.0, -1.0, 1.0), center), _plane((-1.0, 0.0, 0.0), xyz_min + 0.2)],
+            })
+    # A group without seeds gets no cells.
+    groups.append({"co": np.zeros((0, 3)), "min": np.zeros(3), "max": np.ones(3),
+                   "planes": None, "sources": [], "clip_planes": None})
+    return groups
+
+
+def _check_groups(points_scale, margin_bounds, margin_cell):
+    groups = _groups()
+    cellsets = voronoi.groups_to_cellsets([group["co"] for group in groups],
+                                          [group["min"] for group in groups],
+                                          [group["max"] for group in groups],
+                                          points_scale=points_scale,
+                                          margin_bounds=margin_bounds,
+                                          margin_cell=margin_cell,
+                                          groups_planes=[group["planes"] for group in groups],
+                                          groups_sources=[group["sources"] for group in groups],
+                                          groups_clip_planes=[group["clip_planes"] for group in groups])
+    assert len(cellsets) == len(groups)
+    for group, cellset in zip(groups, cellsets):
+        expected = voronoi.points_to_cellset(group["co"], group["min"], group["max"],
+                                             points_scale=points_scale,
+                                             margin_bounds=margin_bounds,
+                                             margin_cell=margin_cell,
+                                             planes=group["planes"],
+                                             sources=group["sources"],
+                                             clip_planes=group["clip_planes"])
+        assert len(cellset) == len(expected)
+        np.testing.assert_array_equal(cellset.seed_ids, expected.seed_ids)
+        np.testing.assert_allclose(cellset.centers, expected.centers)
+        np.testing.assert_array_equal(cellset.vert_offsets, expected.vert_offsets)
+        np.testing.assert_allclose(cellset.verts, expected.verts, atol=1e-5)
+        np.testing.assert_array_equal(cellset.cell_face_offsets, expected.cell_face_offsets)
+        np.testing.assert_array_equal(cellset.face_offsets, expected.face_offsets)
+        np.testing.assert_array_equal(cellset.loops, expected.loops)
+        np.testing.assert_array_equal(cellset.face_planes, expected.face_planes)
+        assert cellset.source_names == expected.source_names
+        np.testing.assert_array_equal(cellset.seed_sources, expected.seed_sources)
+
+
+def test_groups():
+    _check_groups(None, 0.05, 0.0)
+
+
+def test_groups_scale_margin():
+    _check_groups((1.0, 0.5, 2.0), 0.1, 0.02)
+
+
+if __name__ == "__main__":
+    test_groups()
+    test_groups_scale_margin()
+    print("OK")